@@ -0,0 +1,253 @@
+"""
+=====================
+
+GERADORES DE AFD
+
+=====================
+"""
+
+import random
+
+# Todos os geradores devolvem a mesma estrutura de dicionários de ler_afd, com estados 'q0', 'q1', ... e símbolos 's0', 's1', ...
+
+def gera_aleatorio(n, k, proporcao_finais=0.3, semente=0):
+    # AFD completo com destinos sorteados: a maioria dos estados acaba sendo distinguível, então quase nada é condensado
+    sorteio = random.Random(semente)
+    estados = [f'q{i}' for i in range(n)]
+    alfa = [f's{c}' for c in range(k)]
+    return {
+        'alfa': alfa,
+        'estados': estados,
+        'inicial': estados[0],
+        'finais': [estado for estado in estados if sorteio.random() < proporcao_finais],
+        'transicoes': {estado: {simbo: sorteio.choice(estados) for simbo in alfa} for estado in estados}
+    }
+
+def gera_minimo(n, k, semente=0):
+    # AFD que já é mínimo: o primeiro símbolo anda num ciclo q0 -> q1 -> ... -> q0 e só q0 é final, então cada estado
+    # é distinguido dos outros pela quantidade de passos que faltam para voltar a q0. Os demais símbolos são sorteados
+    sorteio = random.Random(semente)
+    estados = [f'q{i}' for i in range(n)]
+    alfa = [f's{c}' for c in range(k)]
+    transicoes = {}
+    for i, estado in enumerate(estados):
+        transicoes[estado] = {simbo: sorteio.choice(estados) for simbo in alfa[1:]}
+        transicoes[estado][alfa[0]] = estados[(i + 1) % n]
+    return {'alfa': alfa, 'estados': estados, 'inicial': estados[0], 'finais': [estados[0]], 'transicoes': transicoes}
+
+def gera_redundante(n, k, copias=10, proporcao_finais=0.3, semente=0):
+    # AFD com muitos estados equivalentes: sorteia um AFD base com n/copias estados e faz várias cópias de cada estado, com
+    # as transições indo para uma cópia qualquer do destino. Todas as cópias de um mesmo estado base são equivalentes
+    sorteio = random.Random(semente)
+    base = max(1, n // copias)
+    destinos_base = [[sorteio.randrange(base) for _ in range(k)] for _ in range(base)]
+    finais_base = [sorteio.random() < proporcao_finais for _ in range(base)]
+
+    estados = [f'q{i}' for i in range(n)]
+    alfa = [f's{c}' for c in range(k)]
+    copias_de = [list(range(b, n, base)) for b in range(base)]  # O estado i é cópia do estado base i % base
+    return {
+        'alfa': alfa,
+        'estados': estados,
+        'inicial': estados[0],
+        'finais': [estado for i, estado in enumerate(estados) if finais_base[i % base]],
+        'transicoes': {
+            estado: {simbo: estados[sorteio.choice(copias_de[destinos_base[i % base][c]])] for c, simbo in enumerate(alfa)}
+            for i, estado in enumerate(estados)
+        }
+    }
+
+def gera_cadeia(n, k, semente=0):
+    # Pior caso para os métodos que refinam por rodadas: uma cadeia q0 -> q1 -> ... -> q(n-1) pelo primeiro símbolo, com só o último
+    # estado final e os demais símbolos voltando para q0. Distinguir qi de qj exige palavras de tamanho até n, então são n rodadas
+    estados = [f'q{i}' for i in range(n)]
+    alfa = [f's{c}' for c in range(k)]
+    transicoes = {}
+    for i, estado in enumerate(estados):
+        transicoes[estado] = {simbo: estados[0] for simbo in alfa[1:]}
+        transicoes[estado][alfa[0]] = estados[min(i + 1, n - 1)]
+    return {'alfa': alfa, 'estados': estados, 'inicial': estados[0], 'finais': [estados[-1]], 'transicoes': transicoes}
+
+GERADORES = {
+    'aleatorio': lambda n, k, finais, semente: gera_aleatorio(n, k, finais, semente),
+    'minimo': lambda n, k, finais, semente: gera_minimo(n, k, semente),
+    'redundante': lambda n, k, finais, semente: gera_redundante(n, k, proporcao_finais=finais, semente=semente),
+    'cadeia': lambda n, k, finais, semente: gera_cadeia(n, k, semente)
+}
+
+def escreve_afd(afd, arquivo):
+    # Grava o AFD no formato lido por ler_afd
+    with open(arquivo, 'w') as f:
+        f.write(f"alfabeto:{','.join(afd['alfa'])}\n")
+        f.write(f"estados:{','.join(afd['estados'])}\n")
+        f.write(f"inicial:{afd['inicial']}\n")
+        f.write(f"finais:{','.join(afd['finais'])}\n")
+        f.write('transicoes\n')
+        for origem, transicoes in afd['transicoes'].items():
+            for simbo, destino in transicoes.items():
+                f.write(f'{origem},{destino},{simbo}\n')
+
+"""
+=====================
+
+MEDIÇÃO
+
+=====================
+"""
+
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+import main
+
+class Medidor:
+    # Guarda o tempo de cada fase e, com memoria=True, o pico de memória alocada durante a fase (via tracemalloc)
+    #
+    # O tracemalloc deixa a execução bem mais lenta, então o benchmark roda as fases duas vezes: uma só cronometrando e outra só medindo memória
+
+    def __init__(self, memoria=False):
+        self.memoria = memoria
+        self.medidas = {}
+
+    @contextmanager
+    def fase(self, nome):
+        if self.memoria:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        yield
+        segundos = time.perf_counter() - inicio
+        if self.memoria:
+            self.medidas[nome] = tracemalloc.get_traced_memory()[1] - base
+        else:
+            self.medidas[nome] = segundos
+
+def executa_fases(arquivo, metodos, limite_quadratico, medidor):
+    # Roda cada fase do programa sobre o arquivo, na ordem do main, e devolve o número de estados do AFD minimizado por cada método
+    with medidor.fase('ler_afd'):
+        afd = main.ler_afd(arquivo)
+    with medidor.fase('ler_afd_compacto'):
+        main.ler_afd_compacto(arquivo)
+    with medidor.fase('validar_afd'):
+        main.relatorio_afd(afd)
+
+    # As fases do Table Filling Method são quadráticas no número de estados: acima do limite, ficam de fora
+    quadratico = len(afd['estados']) <= limite_quadratico
+    if quadratico:
+        afdc = main.prepara_afd(afd)
+        with medidor.fase('prepara_simbolos'):
+            afdc_classes = main.prepara_simbolos(afdc)
+        # Como em myhill_nerode, só a derivação usa as classes de símbolos; o resto usa o AFD com o alfabeto completo
+        matriz = main.MatrizTriangular(len(afdc.estados))
+        with medidor.fase('preenche_matriz_inicial'):
+            main.preenche_matriz_inicial(afdc, matriz)
+        with medidor.fase('deriva_estados_matriz'):
+            main.deriva_estados_matriz(afdc_classes, matriz)
+        with medidor.fase('condensa_estados'):
+            estadosAfdMin, _, _, bloco_de = main.condensa_estados(afdc, matriz)
+        with medidor.fase('preenche_transicoes'):
+            main.preenche_transicoes(afdc, estadosAfdMin, bloco_de)
+
+    minimizados = {}
+    for metodo in metodos:
+        if metodo == 'myhill_nerode' and not quadratico:
+            continue
+        with medidor.fase(metodo):
+            afd_minimizado = main.METODOS[metodo](afd, None, validar=False)
+        minimizados[metodo] = len(afd_minimizado['estados'])
+    return minimizados
+
+def mede(gerador, n, k, proporcao_finais, semente, metodos, limite_quadratico, diretorio, memoria):
+    arquivo = os.path.join(diretorio, f'{gerador}_{n}_{k}.txt')
+    escreve_afd(GERADORES[gerador](n, k, proporcao_finais, semente), arquivo)
+
+    cronometro = Medidor()
+    minimizados = executa_fases(arquivo, metodos, limite_quadratico, cronometro)
+
+    picos = {}
+    if memoria:
+        tracemalloc.start()
+        medidor_memoria = Medidor(memoria=True)
+        executa_fases(arquivo, metodos, limite_quadratico, medidor_memoria)
+        tracemalloc.stop()
+        picos = medidor_memoria.medidas
+
+    return [
+        {
+            'gerador': gerador,
+            'n': n,
+            'k': k,
+            'fase': fase,
+            'segundos': segundos,
+            'pico_bytes': picos.get(fase),
+            'estados_minimizado': minimizados.get(fase)
+        }
+        for fase, segundos in cronometro.medidas.items()
+    ]
+
+"""
+=====================
+
+CÓDIGO PRINCIPAL
+
+=====================
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+
+def mostra_tabela(medidas):
+    print(f"{'gerador':<11} {'n':>8} {'k':>4} {'fase':<24} {'segundos':>10} {'pico (MiB)':>11} {'mínimo':>8}")
+    for medida in medidas:
+        pico = f"{medida['pico_bytes'] / 2 ** 20:.2f}" if medida['pico_bytes'] is not None else '-'
+        minimo = medida['estados_minimizado'] if medida['estados_minimizado'] is not None else ''
+        print(f"{medida['gerador']:<11} {medida['n']:>8} {medida['k']:>4} {medida['fase']:<24} {medida['segundos']:>10.4f} {pico:>11} {minimo:>8}")
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description='Benchmark das fases e dos métodos do minimizador de AFD')
+    parser.add_argument('-n', '--tamanhos', type=int, nargs='+', default=[100, 1000, 10000], help='números de estados (padrão: 100 1000 10000)')
+    parser.add_argument('-k', '--alfabeto', type=int, default=2, help='tamanho do alfabeto (padrão: 2)')
+    parser.add_argument('--finais', type=float, default=0.3, help='proporção de estados finais nos geradores aleatórios (padrão: 0.3)')
+    parser.add_argument('-g', '--geradores', nargs='+', choices=GERADORES, default=list(GERADORES), help='tipos de AFD gerados (padrão: todos)')
+    parser.add_argument('-m', '--metodos', nargs='+', choices=main.METODOS, default=list(main.METODOS), help='métodos medidos (padrão: todos)')
+    parser.add_argument('--limite-quadratico', type=int, default=3000, help='acima desse número de estados, as fases do Table Filling Method não são medidas (padrão: 3000)')
+    parser.add_argument('--sem-memoria', action='store_true', help='não mede o pico de memória (evita a segunda execução com tracemalloc)')
+    parser.add_argument('--semente', type=int, default=0, help='semente dos geradores (padrão: 0)')
+    parser.add_argument('--diretorio', help='onde gravar os AFDs gerados (padrão: um diretório temporário)')
+    parser.add_argument('-o', '--saida', default='bench_output.json', help='relatório JSON (padrão: bench_output.json)')
+    args = parser.parse_args()
+
+    # Sem --diretorio, os AFDs gerados vão para um diretório temporário, apagado ao fim das medidas
+    if args.diretorio:
+        os.makedirs(args.diretorio, exist_ok=True)
+        contexto = nullcontext(args.diretorio)
+    else:
+        contexto = tempfile.TemporaryDirectory(prefix='afd_benchmark_')
+
+    medidas = []
+    with contexto as diretorio:
+        for gerador in args.geradores:
+            for n in args.tamanhos:
+                print(f'Medindo {gerador} com {n} estados...', file=sys.stderr)
+                medidas.extend(mede(gerador, n, args.alfabeto, args.finais, args.semente, args.metodos, args.limite_quadratico, diretorio, not args.sem_memoria))
+
+    relatorio = {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'parametros': vars(args),
+        'medidas': medidas
+    }
+    with open(args.saida, 'w') as f:
+        json.dump(relatorio, f, indent=4)
+
+    mostra_tabela(medidas)
+    print(f'\nRelatório gravado em {args.saida}', file=sys.stderr)
+
+if __name__ == "__main__":
+    main_benchmark()
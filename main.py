@@ -7,10 +7,6 @@ LER ARQUIVO TXT
 """
 
 def ler_afd(arquivo):
-    # Abre o arquivo e lê todas as linhas
-    with open(arquivo, 'r') as f:
-        linhas = f.readlines()
-
     # Inicializa a estrutura de dados do AFD com listas vazias e dicionários
     afd = {
         'alfa': [],         # Alfabeto
@@ -20,48 +16,296 @@ def ler_afd(arquivo):
         'transicoes': {}    # Transições do autômato
     }
 
-    # Processa cada linha do arquivo
-    for linha in linhas:
-        linha = linha.strip()  # Remove espaços em branco nas extremidades da linha
+    # Abre o arquivo e processa uma linha por vez, sem carregar o arquivo inteiro na memória
+    with open(arquivo, 'r') as f:
+        for linha in f:
+            linha = linha.strip()  # Remove espaços em branco nas extremidades da linha
 
-        # Identifica a linha com o alfabeto e separa os símbolos
-        if linha.startswith('alfabeto:'):
-            afd['alfa'] = linha.split(':')[1].split(',')  # Divide a linha no ':' e pega o segundo elemento (alfabeto)
+            # Ignora linhas em branco
+            if not linha:
+                continue
 
-        # Identifica a linha com os estados e separa os estados
-        elif linha.startswith('estados:'):
-            afd['estados'] = linha.split(':')[1].split(',')  # Divide a linha no ':' e pega o segundo elemento (estados)
+            # Identifica a linha com o alfabeto e separa os símbolos
+            if linha.startswith('alfabeto:'):
+                afd['alfa'] = linha.split(':')[1].split(',')  # Divide a linha no ':' e pega o segundo elemento (alfabeto)
 
-        # Identifica a linha com o estado inicial
-        elif linha.startswith('inicial:'):
-            afd['inicial'] = linha.split(':')[1]  # Divide a linha no ':' e pega o estado inicial
+            # Identifica a linha com os estados e separa os estados
+            elif linha.startswith('estados:'):
+                afd['estados'] = linha.split(':')[1].split(',')  # Divide a linha no ':' e pega o segundo elemento (estados)
 
-        # Identifica a linha com os estados finais e os separa
-        elif linha.startswith('finais:'):
-            afd['finais'] = linha.split(':')[1].split(',')  # Divide a linha no ':' e pega os estados finais
+            # Identifica a linha com o estado inicial
+            elif linha.startswith('inicial:'):
+                afd['inicial'] = linha.split(':')[1]  # Divide a linha no ':' e pega o estado inicial
 
-        # Ignora a linha de transições, pois ela será tratada a seguir
-        elif linha.startswith('transicoes'):
-            continue
+            # Identifica a linha com os estados finais e os separa
+            elif linha.startswith('finais:'):
+                afd['finais'] = linha.split(':')[1].split(',')  # Divide a linha no ':' e pega os estados finais
 
-        # As linhas restantes representam as transições do AFD
-        else:
-            origem, destino, simbolo = linha.split(',')  # Divide a linha nas vírgulas para pegar origem, destino e símbolo
+            # Ignora a linha de transições, pois ela será tratada a seguir
+            elif linha.startswith('transicoes'):
+                continue
 
-            # Se a origem ainda não está no dicionário de transições, inicializa-a como um novo dicionário
-            if origem not in afd['transicoes']:
-                afd['transicoes'][origem] = {}
+            # As linhas restantes representam as transições do AFD
+            else:
+                origem, destino, simbolo = linha.split(',')  # Divide a linha nas vírgulas para pegar origem, destino e símbolo
 
-            # Verifica se já existe uma transição para o mesmo símbolo
-            if simbolo in afd['transicoes'][origem]:
-                print(f"Erro: Estado '{origem}' já possui uma transição para o símbolo '{simbolo}'.")
-                return None  # Retorna um AFD inválido
+                # Se a origem ainda não está no dicionário de transições, inicializa-a como um novo dicionário
+                if origem not in afd['transicoes']:
+                    afd['transicoes'][origem] = {}
 
-            # Adiciona a transição para o símbolo fornecido
-            afd['transicoes'][origem][simbolo] = destino
+                # Verifica se já existe uma transição para o mesmo símbolo
+                if simbolo in afd['transicoes'][origem]:
+                    print(f"Erro: Estado '{origem}' já possui uma transição para o símbolo '{simbolo}'.")
+                    return None  # Retorna um AFD inválido
+
+                # Adiciona a transição para o símbolo fornecido
+                afd['transicoes'][origem][simbolo] = destino
 
     return afd  # Retorna o AFD lido do arquivo
 
+# Início das linhas de cabeçalho do arquivo (as demais linhas são transições)
+CABECALHOS = ('alfabeto:', 'estados:', 'inicial:', 'finais:', 'transicoes')
+
+def le_cabecalho(arquivo):
+    # Lê só as linhas de cabeçalho do arquivo, onde quer que estejam. Como em ler_afd, se uma linha se repetir, vale a última
+    alfa, estados, inicial, finais = [], [], '', []
+    with open(arquivo, 'r') as f:
+        for linha in f:
+            linha = linha.strip()
+            if linha.startswith('alfabeto:'):
+                alfa = linha.split(':')[1].split(',')
+            elif linha.startswith('estados:'):
+                estados = linha.split(':')[1].split(',')
+            elif linha.startswith('inicial:'):
+                inicial = linha.split(':')[1]
+            elif linha.startswith('finais:'):
+                finais = linha.split(':')[1].split(',')
+    return alfa, estados, inicial, finais
+
+def ler_afd_compacto(arquivo, problemas=None, cabecalho=None):
+    # Lê o mesmo formato de ler_afd, mas linha a linha e direto para a representação compacta (AFDCompacto), sem montar os dicionários
+    # de transições: cada linha de transição vira dois inteiros, a posição q*k + c e o destino. Enquanto as transições lidas ocupam menos
+    # de 1/DENSIDADE_TABELA da tabela n×k, elas ficam em arrays (e o AFD sai na forma esparsa); a partir daí, passam para a tabela densa
+    #
+    # A tabela só pode ser criada quando já se sabe o alfabeto e os estados, então no caso comum (cabeçalho antes das transições) o arquivo
+    # é lido uma única vez. Como em ler_afd, as linhas podem vir em qualquer ordem e a linha 'transicoes' é opcional: se uma transição aparecer
+    # antes das linhas 'alfabeto:' e 'estados:', ou se uma delas aparecer de novo depois das transições, o arquivo é lido outra vez, com o
+    # cabeçalho já lido por le_cabecalho (recebido em 'cabecalho')
+    #
+    # Os problemas de estados, símbolos e transições são conferidos aqui mesmo, durante a leitura (as transições repetidas, quando o AFD
+    # ainda está na forma esparsa, só no fim). Se 'problemas' for uma lista, eles são anotados nela (no formato de relatorio_afd) e a leitura
+    # continua; sem a lista, o primeiro problema interrompe a leitura
+    def registra(problema):
+        if problemas is None:
+            print(descreve_problema(problema))
+            return True  # Interrompe a leitura
+        problemas.append(problema)
+        return False
+
+    quantidade = len(problemas) if problemas is not None else 0
+
+    def le_de_novo():
+        # Descarta o que foi anotado nesta leitura e lê o arquivo de novo, agora com o cabeçalho completo
+        if problemas is not None:
+            del problemas[quantidade:]
+        return ler_afd_compacto(arquivo, problemas, le_cabecalho(arquivo))
+
+    def cria_indices():
+        # Índices dos estados e dos símbolos (anotando os repetidos) e o número de transições a partir do qual a tabela densa compensa
+        indice_estado = indexa_nomes(estados, 'estado_duplicado', 'estado', registra)
+        indice_simbolo = indexa_nomes(alfa, 'simbolo_duplicado', 'simbolo', registra)
+        if indice_estado is None or indice_simbolo is None:
+            return None
+        return indice_estado, indice_simbolo, -(-len(estados) * len(alfa) // DENSIDADE_TABELA)
+
+    indice_estado = None  # Índices dos estados e dos símbolos, criados quando já se sabe o alfabeto e os estados
+    transicoes = None     # Tabela densa, criada quando as transições lidas chegam a 'limite'
+    posicoes = array('q') # Antes disso, cada transição lida fica em três arrays: posição q*k + c, destino e número da linha
+    alvos = array('i')
+    numeros = array('i')
+    if cabecalho is None:
+        alfa = estados = None  # None: a linha ainda não apareceu
+        inicial = ''
+        finais = []
+    else:
+        alfa, estados, inicial, finais = cabecalho
+        indices = cria_indices()
+        if indices is None:
+            return None
+        indice_estado, indice_simbolo, limite = indices
+        k = len(alfa)
+
+    with open(arquivo, 'r') as f:
+        for numero, linha in enumerate(f, 1):
+            linha = linha.strip()
+
+            if not linha:
+                continue
+
+            # A primeira linha depois do cabeçalho (a linha 'transicoes' ou já uma transição) cria os índices
+            if indice_estado is None and not linha.startswith(CABECALHOS[:4]):
+                if alfa is None or estados is None:
+                    if linha.startswith('transicoes'):
+                        continue
+                    return le_de_novo()
+                indices = cria_indices()
+                if indices is None:
+                    return None
+                indice_estado, indice_simbolo, limite = indices
+                k = len(alfa)
+                if linha.startswith('transicoes'):
+                    continue
+
+            # Linhas de transição: o caso mais comum, então é testado primeiro
+            if indice_estado is not None:
+                # Caminho rápido: a linha está certa. Os casos de erro só são separados quando alguma busca falha
+                try:
+                    origem, destino, simbolo = linha.split(',')
+                    posicao = indice_estado[origem] * k + indice_simbolo[simbolo]
+                    alvo = indice_estado[destino]
+                except (ValueError, KeyError):
+                    # Linha de cabeçalho depois das transições: na segunda leitura o cabeçalho já é conhecido, e o estado inicial e os finais
+                    # só são usados no fim da leitura. Um novo alfabeto ou novos estados invalidam os índices, então o arquivo é lido de novo
+                    if linha.startswith(CABECALHOS):
+                        if cabecalho is not None or linha.startswith('transicoes'):
+                            continue
+                        if linha.startswith('inicial:'):
+                            inicial = linha.split(':')[1]
+                            continue
+                        if linha.startswith('finais:'):
+                            finais = linha.split(':')[1].split(',')
+                            continue
+                        return le_de_novo()
+
+                    if linha.count(',') != 2:
+                        if registra({'tipo': 'linha_invalida', 'conteudo': linha, 'linha': numero}):
+                            return None
+                        continue
+                    if origem not in indice_estado and registra({'tipo': 'origem_desconhecida', 'estado': origem, 'linha': numero}):
+                        return None
+                    if destino not in indice_estado and registra({'tipo': 'destino_desconhecido', 'estado': origem, 'simbolo': simbolo, 'destino': destino, 'linha': numero}):
+                        return None
+                    if simbolo not in indice_simbolo and registra({'tipo': 'simbolo_desconhecido', 'estado': origem, 'simbolo': simbolo, 'linha': numero}):
+                        return None
+                    continue
+
+                if transicoes is None:
+                    posicoes.append(posicao)
+                    alvos.append(alvo)
+                    numeros.append(numero)
+                    if len(posicoes) >= limite:
+                        # As transições já ocupam 1/DENSIDADE_TABELA da tabela: passa para a tabela densa, e daqui em diante as repetidas
+                        # são encontradas na própria tabela
+                        lidas = descarta_repetidas(posicoes, alvos, numeros, estados, alfa, registra)
+                        if lidas is None:
+                            return None
+                        tabela = np.full(len(estados) * k, -1, dtype=np.int32)
+                        tabela[lidas[0]] = lidas[1]
+                        transicoes = para_array(tabela)
+                        posicoes = alvos = numeros = None
+                    continue
+
+                if transicoes[posicao] >= 0:
+                    if registra({'tipo': 'transicao_duplicada', 'estado': origem, 'simbolo': simbolo, 'linha': numero}):
+                        return None
+                    continue
+                transicoes[posicao] = alvo
+
+            elif linha.startswith('alfabeto:'):
+                alfa = linha.split(':')[1].split(',')
+            elif linha.startswith('estados:'):
+                estados = linha.split(':')[1].split(',')
+            elif linha.startswith('inicial:'):
+                inicial = linha.split(':')[1]
+            elif linha.startswith('finais:'):
+                finais = linha.split(':')[1].split(',')
+
+    # Arquivo sem nenhuma transição
+    if indice_estado is None:
+        alfa = alfa or []
+        estados = estados or []
+        if cria_indices() is None:
+            return None
+
+    indice_estado = {estado: i for i, estado in enumerate(estados)}
+
+    # Um estado inicial desconhecido fica como -1 (o AFD só é devolvido assim quando o problema foi anotado em 'problemas')
+    indice_inicial = indice_estado.get(inicial, -1)
+    if indice_inicial < 0 and registra({'tipo': 'inicial_desconhecido', 'estado': inicial}):
+        return None
+
+    vetor_finais = bytearray(len(estados))
+    for final in finais:
+        if final not in indice_estado:
+            if registra({'tipo': 'final_desconhecido', 'estado': final}):
+                return None
+            continue
+        vetor_finais[indice_estado[final]] = 1
+
+    if transicoes is not None:
+        return AFDCompacto(estados, alfa, indice_inicial, vetor_finais, transicoes)
+
+    lidas = descarta_repetidas(posicoes, alvos, numeros, estados, alfa, registra)
+    if lidas is None:
+        return None
+    return AFDCompacto.de_transicoes(estados, alfa, indice_inicial, vetor_finais, *lidas)
+
+def descarta_repetidas(posicoes, alvos, numeros, estados, alfa, registra):
+    # Tira das transições lidas por ler_afd_compacto (posição q*k + c, destino e número da linha) as que repetem um estado e um símbolo,
+    # anotando cada uma na ordem do arquivo: como na tabela densa, vale a primeira. Retorna as posições e os destinos que sobram
+    # (arrays NumPy), ou None se a leitura deve parar
+    k = len(alfa)
+    posicoes = np.frombuffer(posicoes, dtype=np.int64)
+    alvos = np.frombuffer(alvos, dtype=np.int32)
+
+    # Na ordenação estável, as repetições de uma posição ficam logo depois da primeira leitura dela
+    ordem = np.argsort(posicoes, kind='stable')
+    repetidas = np.sort(ordem[1:][posicoes[ordem[1:]] == posicoes[ordem[:-1]]])
+    for t in repetidas.tolist():
+        q, c = divmod(int(posicoes[t]), k)
+        if registra({'tipo': 'transicao_duplicada', 'estado': estados[q], 'simbolo': alfa[c], 'linha': numeros[t]}):
+            return None
+
+    if len(repetidas):
+        manter = np.ones(len(posicoes), dtype=bool)
+        manter[repetidas] = False
+        posicoes, alvos = posicoes[manter], alvos[manter]
+    return posicoes, alvos
+
+def indexa_nomes(nomes, tipo, chave, registra):
+    # Monta o dicionário nome -> índice, registrando os nomes repetidos (que ficam com o primeiro índice). Retorna None se a leitura deve parar
+    indice = {}
+    for i, nome in enumerate(nomes):
+        if nome in indice:
+            if registra({'tipo': tipo, chave: nome}):
+                return None
+            continue
+        indice[nome] = i
+    return indice
+
+def carrega_afd(arquivo, cache=False, problemas=None):
+    # Carrega o AFD na representação compacta: arquivos .afdb são abertos direto (mapeados na memória), e arquivos .txt são lidos linha a linha
+    # (com os problemas de leitura anotados em 'problemas', como em ler_afd_compacto)
+    #
+    # Com cache=True, o resultado da leitura do .txt é salvo ao lado dele em '<arquivo>.afdb', e as próximas leituras usam o binário
+    # enquanto ele for mais novo que o .txt
+    if arquivo.endswith('.afdb'):
+        return carrega_afd_binario(arquivo)
+
+    binario = arquivo + '.afdb'
+    if cache and os.path.exists(binario) and os.path.getmtime(binario) >= os.path.getmtime(arquivo):
+        afdc = carrega_afd_binario(binario)
+        if afdc is not None:
+            return afdc
+
+    quantidade = len(problemas) if problemas is not None else 0
+    afdc = ler_afd_compacto(arquivo, problemas)
+
+    # Só guarda no cache AFDs lidos sem problemas
+    if cache and afdc is not None and (problemas is None or len(problemas) == quantidade):
+        salva_afd_binario(afdc, binario)
+    return afdc
+
 """
 =====================
 
@@ -70,60 +314,520 @@ VALIDAR AFD
 =====================
 """
 
-def validar_afd(afd):
-    # Verifica se o estado inicial está nos estados
-    if afd['inicial'] not in afd['estados']:
-        # Se o estado inicial não estiver na lista de estados, imprime um erro e retorna False
-        print(f"Erro: Estado inicial '{afd['inicial']}' não está nos estados.")
-        return False
+def relatorio_afd(afd):
+    # Confere o AFD inteiro de uma vez e devolve a lista de todos os problemas encontrados (lista vazia se o AFD for válido)
+    #
+    # Cada problema é um dicionário com a chave 'tipo' e os estados/símbolos envolvidos (veja descreve_problema). As buscas usam sets,
+    # então a conferência custa O(n·k), e não O(n²·k) como os testes "in" sobre as listas de estados e de símbolos
+    problemas = []
 
-    # Verifica se todos os estados finais estão nos estados
-    for final in afd['finais']:
-        if final not in afd['estados']:
-            print(f"Erro: Estado final '{final}' não está nos estados.")
-            return False
+    # Transições ausentes não são um problema: o AFD pode ser parcial, e elas vão para um estado de erro implícito (veja completa_afd)
+    #
+    # O AFD compacto já vem com estados, símbolos, estado inicial, finais e transições conferidos na leitura (veja ler_afd_compacto)
+    if isinstance(afd, AFDCompacto):
+        return problemas
 
-    # Verifica se todos os estados das transições são válidos
-    for estado in afd['transicoes']:
-        if not estado in afd['estados']:
-            print(f"Erro: Estado '{estado}' não está nos estados válidos.")
-            return False
+    # Monta os sets de estados e de símbolos, anotando os repetidos
+    estados = set()
+    for estado in afd['estados']:
+        if estado in estados:
+            problemas.append({'tipo': 'estado_duplicado', 'estado': estado})
+        estados.add(estado)
 
-    # Verifica se todas as transições são válidas
-    for origem in afd['estados']:
-        if origem not in afd['transicoes']:
-            print(f"Erro: Estado '{origem}' não possui transições.")
-            return False
-        
-        transicoes = afd['transicoes'][origem]
+    alfa = set()
+    for simbolo in afd['alfa']:
+        if simbolo in alfa:
+            problemas.append({'tipo': 'simbolo_duplicado', 'simbolo': simbolo})
+        alfa.add(simbolo)
 
-        # Verifica se o número de transições é igual ao número de símbolos no alfabeto
-        if len(transicoes) != len(afd['alfa']):
-            print(f"Erro: Estado '{origem}' não possui transições para todos os símbolos do alfabeto.")
-            return False
+    # Verifica se o estado inicial e os estados finais estão nos estados
+    if afd['inicial'] not in estados:
+        problemas.append({'tipo': 'inicial_desconhecido', 'estado': afd['inicial']})
+
+    for final in afd['finais']:
+        if final not in estados:
+            problemas.append({'tipo': 'final_desconhecido', 'estado': final})
+
+    # Verifica se as transições só usam estados e símbolos válidos
+    for origem, transicoes in afd['transicoes'].items():
+        if origem not in estados:
+            problemas.append({'tipo': 'origem_desconhecida', 'estado': origem})
 
-        # Verifica se há mais de uma transição para o mesmo símbolo
-        simbolos_vistos = set()
         for simbolo, destino in transicoes.items():
-            # Verifica se o destino é um estado válido
-            if destino not in afd['estados']:
-                print(f"Erro: O estado destino '{destino}' na transição do estado '{origem}' não é um estado válido.")
-                return False
+            if destino not in estados:
+                problemas.append({'tipo': 'destino_desconhecido', 'estado': origem, 'simbolo': simbolo, 'destino': destino})
+            if simbolo not in alfa:
+                problemas.append({'tipo': 'simbolo_desconhecido', 'estado': origem, 'simbolo': simbolo})
+
+    return problemas
+
+def descreve_problema(problema):
+    # Texto de erro de um problema do relatório de validação (ou da leitura do arquivo)
+    tipo = problema['tipo']
+
+    if tipo == 'estado_duplicado':
+        texto = f"Estado '{problema['estado']}' aparece mais de uma vez nos estados."
+    elif tipo == 'simbolo_duplicado':
+        texto = f"O símbolo '{problema['simbolo']}' aparece mais de uma vez no alfabeto."
+    elif tipo == 'inicial_desconhecido':
+        texto = f"Estado inicial '{problema['estado']}' não está nos estados."
+    elif tipo == 'final_desconhecido':
+        texto = f"Estado final '{problema['estado']}' não está nos estados."
+    elif tipo == 'origem_desconhecida':
+        texto = f"Estado '{problema['estado']}' não está nos estados válidos."
+    elif tipo == 'destino_desconhecido':
+        texto = f"O estado destino '{problema['destino']}' na transição do estado '{problema['estado']}' não é um estado válido."
+    elif tipo == 'simbolo_desconhecido':
+        texto = f"O símbolo '{problema['simbolo']}' na transição do estado '{problema['estado']}' não pertence ao alfabeto."
+    elif tipo == 'transicao_duplicada':
+        texto = f"Estado '{problema['estado']}' já possui uma transição para o símbolo '{problema['simbolo']}'."
+    elif tipo == 'linha_invalida':
+        texto = f"Linha '{problema['conteudo']}' fora do formato: as transições devem vir depois da linha 'transicoes', no formato origem,destino,simbolo."
+    else:
+        texto = str(problema)
 
-            # Verifica se o símbolo está no alfabeto
-            if simbolo not in afd['alfa']:
-                print(f"Erro: O símbolo '{simbolo}' não pertence ao alfabeto.")
-                return False
+    # Problemas encontrados na leitura do arquivo também informam a linha
+    if 'linha' in problema:
+        texto += f" (linha {problema['linha']})"
 
-            # Verifica se o símbolo já foi usado
-            if simbolo in simbolos_vistos:
-                print(f"Erro: O estado '{origem}' possui mais de uma transição para o símbolo '{simbolo}'.")
-                return False
+    return f"Erro: {texto}"
 
-            simbolos_vistos.add(simbolo)
+def validar_afd(afd, problemas=()):
+    # Imprime todos os problemas do AFD, junto com os que já tenham sido encontrados na leitura do arquivo ('problemas'),
+    # e retorna True se não houver nenhum
+    relatorio = list(problemas) + relatorio_afd(afd)
 
-    # Se todas as verificações passarem, retorna True
-    return True
+    for problema in relatorio:
+        print(descreve_problema(problema))
+
+    return not relatorio
+
+"""
+=====================
+
+REPRESENTAÇÃO COMPACTA
+
+=====================
+"""
+
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+# Acima de uma transição a cada DENSIDADE_TABELA posições da tabela n×k, a tabela densa ocupa menos memória que a forma esparsa
+# (que guarda, por transição, o símbolo e o destino, além do início da linha de cada estado)
+DENSIDADE_TABELA = 4
+
+def para_array(valores):
+    # Converte um array NumPy de inteiros para array('i') (o formato das transições do AFD compacto)
+    return array('i', np.ascontiguousarray(valores, dtype=np.int32).tobytes())
+
+class AFDCompacto:
+    # Representação do AFD com estados e símbolos trocados por inteiros: o estado afd['estados'][i] vira i e o símbolo afd['alfa'][c] vira c
+    #
+    # As transições ficam de uma de duas formas:
+    #
+    # densa: uma tabela n×k contígua de inteiros de 32 bits (array 'i'), onde o destino do estado q lendo o símbolo c está na posição
+    # q*k + c (-1 se a transição não existir)
+    # esparsa (AFDs parciais com poucas transições por estado): só as transições que existem, por estado, em três arrays 'i'
+    # (inicio, simbolos, destinos): as do estado q estão nas posições inicio[q]:inicio[q + 1], em ordem crescente de símbolo
+    #
+    # Os estados finais ficam num bytearray de n posições (1 se o estado é final). 'erro' é o índice do estado de erro implícito
+    # acrescentado por completa_afd (o último estado, -1 se não houver): ele não tem transições guardadas, e é o destino de todas
+    # as transições ausentes, inclusive as dele mesmo
+
+    __slots__ = ('estados', 'alfa', 'indice_estado', 'indice_simbolo', 'inicial', 'finais', 'transicoes', 'esparsa', 'erro')
+
+    def __init__(self, estados, alfa, inicial, finais, transicoes, esparsa=None, erro=-1):
+        self.estados = estados                                                # Nomes dos estados, na ordem dos índices
+        self.alfa = alfa                                                      # Símbolos do alfabeto, na ordem dos índices
+        self.indice_estado = {}                                               # Nome do estado -> índice (o primeiro, se o nome se repetir)
+        for i, estado in enumerate(estados):
+            self.indice_estado.setdefault(estado, i)
+        self.indice_simbolo = {}                                              # Símbolo -> índice (o primeiro, se o símbolo se repetir)
+        for c, simbo in enumerate(alfa):
+            self.indice_simbolo.setdefault(simbo, c)
+        self.inicial = inicial                                                # Índice do estado inicial
+        self.finais = finais                                                  # bytearray: finais[q] == 1 se q é final
+        self.transicoes = transicoes                                          # array('i') com n*k destinos (None na forma esparsa)
+        self.esparsa = esparsa                                                # (inicio, simbolos, destinos) na forma esparsa, ou None
+        self.erro = erro                                                      # Índice do estado de erro implícito (-1 se não houver)
+
+    @classmethod
+    def de_transicoes(cls, estados, alfa, inicial, finais, posicoes, destinos):
+        # Monta o AFD a partir das transições que existem, dadas pelas posições q*k + c na tabela (sem repetições) e pelos destinos,
+        # escolhendo a forma densa ou a esparsa conforme a quantidade de transições (veja DENSIDADE_TABELA)
+        n = len(estados)
+        k = len(alfa)
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+
+        if DENSIDADE_TABELA * len(posicoes) >= n * k:
+            tabela = np.full(n * k, -1, dtype=np.int32)
+            tabela[posicoes] = destinos
+            return cls(estados, alfa, inicial, finais, para_array(tabela))
+
+        ordem = np.argsort(posicoes, kind='stable')
+        posicoes = posicoes[ordem]
+        inicio = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(posicoes // max(k, 1), minlength=n), out=inicio[1:])
+        esparsa = (para_array(inicio), para_array(posicoes % max(k, 1)), para_array(np.asarray(destinos)[ordem]))
+        return cls(estados, alfa, inicial, finais, None, esparsa)
+
+    @classmethod
+    def de_dict(cls, afd):
+        # Converte a estrutura de dicionários devolvida por ler_afd para a representação compacta
+        estados = list(afd['estados'])
+        alfa = list(afd['alfa'])
+        indice_estado = {estado: i for i, estado in enumerate(estados)}
+        indice_simbolo = {simbo: c for c, simbo in enumerate(alfa)}
+        k = len(alfa)
+
+        posicoes = array('q')
+        destinos = array('i')
+        for origem, transicoes_origem in afd['transicoes'].items():
+            base = indice_estado[origem] * k
+            for simbo, destino in transicoes_origem.items():
+                posicoes.append(base + indice_simbolo[simbo])
+                destinos.append(indice_estado[destino])
+
+        finais = bytearray(len(estados))
+        for final in afd['finais']:
+            finais[indice_estado[final]] = 1
+
+        return cls.de_transicoes(estados, alfa, indice_estado[afd['inicial']], finais, posicoes, destinos)
+
+    def para_dict(self):
+        # Converte de volta para a estrutura de dicionários usada no resto do programa
+        return {
+            'alfa': list(self.alfa),
+            'estados': list(self.estados),
+            'inicial': self.estados[self.inicial],
+            'finais': [estado for q, estado in enumerate(self.estados) if self.finais[q]],
+            'transicoes': {
+                estado: {self.alfa[c]: self.estados[destino] for c, destino in self.transicoes_de(q)}
+                for q, estado in enumerate(self.estados)
+            }
+        }
+
+    def transicoes_de(self, q):
+        # Transições guardadas do estado q, como pares (símbolo, destino) em ordem de símbolo (sem as que vão para o estado de erro implícito)
+        if q == self.erro:
+            return []
+        if self.esparsa is not None:
+            inicio, simbolos, destinos = self.esparsa
+            return list(zip(simbolos[inicio[q]:inicio[q + 1]], destinos[inicio[q]:inicio[q + 1]]))
+        k = len(self.alfa)
+        return [(c, destino) for c, destino in enumerate(self.transicoes[q * k:(q + 1) * k]) if destino >= 0]
+
+    def linha(self, q):
+        # Destinos do estado q lendo cada símbolo, com o estado de erro (ou -1, se não houver) no lugar das transições ausentes
+        linha = [self.erro] * len(self.alfa)
+        for c, destino in self.transicoes_de(q):
+            linha[c] = destino
+        return linha
+
+    def destino(self, q, c):
+        # Destino do estado q lendo o símbolo c (o estado de erro, ou -1 se não houver, quando a transição não existir)
+        if q == self.erro:
+            return self.erro
+        if self.esparsa is not None:
+            inicio, simbolos, destinos = self.esparsa
+            posicao = bisect_left(simbolos, c, inicio[q], inicio[q + 1])
+            return destinos[posicao] if posicao < inicio[q + 1] and simbolos[posicao] == c else self.erro
+        destino = self.transicoes[q * len(self.alfa) + c]
+        return destino if destino >= 0 else self.erro
+
+    def quantidade_transicoes(self):
+        # Número de transições guardadas (sem contar as que vão para o estado de erro implícito)
+        if self.esparsa is not None:
+            return len(self.esparsa[2])
+        return int(np.count_nonzero(np.frombuffer(self.transicoes, dtype=np.int32) >= 0))
+
+    def tabela(self):
+        # Tabela densa n×k de destinos (array NumPy de int64), com o estado de erro (ou -1) no lugar das transições ausentes. É a forma que
+        # os algoritmos que percorrem todas as transições (Moore, Reconhecedor) usam; os outros trabalham direto sobre as transições guardadas
+        n = len(self.estados)
+        k = len(self.alfa)
+        tabela = np.full((n, k), self.erro, dtype=np.int64)
+        if self.esparsa is not None:
+            inicio, simbolos, destinos = (np.frombuffer(v, dtype=np.int32) for v in self.esparsa)
+            origens = np.repeat(np.arange(len(inicio) - 1), np.diff(inicio))
+            tabela[origens, simbolos] = destinos
+        else:
+            guardadas = np.frombuffer(self.transicoes, dtype=np.int32).reshape(-1, k) if k else np.zeros((0, 0), dtype=np.int32)
+            tabela[:len(guardadas)] = np.where(guardadas >= 0, guardadas, self.erro)
+        return tabela
+
+    def inversas(self):
+        # Transições inversas, agrupadas por destino (ordenação por contagem): as transições que chegam em q são as posições
+        # inicio[q]:inicio[q + 1] de 'simbolos' e 'origens', em ordem de símbolo e depois de origem. Devolve (inicio, simbolos, origens),
+        # três arrays 'i'. As transições ausentes (para o estado de erro implícito) não entram
+        n = len(self.estados)
+        k = len(self.alfa)
+        if self.esparsa is not None:
+            inicio, simbolos, destinos = (np.frombuffer(v, dtype=np.int32) for v in self.esparsa)
+            origens = np.repeat(np.arange(len(inicio) - 1, dtype=np.int32), np.diff(inicio))
+        else:
+            guardadas = np.frombuffer(self.transicoes, dtype=np.int32)
+            posicoes = np.flatnonzero(guardadas >= 0)
+            destinos = guardadas[posicoes]
+            origens, simbolos = np.divmod(posicoes, max(k, 1))
+
+        ordem = np.lexsort((origens, simbolos, destinos))
+        inicio = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(destinos, minlength=n), out=inicio[1:])
+        return para_array(inicio), para_array(simbolos[ordem]), para_array(origens[ordem])
+
+def remove_inalcancaveis(afdc):
+    # Busca em largura a partir do estado inicial: os estados que nunca são visitados não podem ser alcançados por nenhuma palavra,
+    # então não mudam a linguagem do AFD e podem ser descartados antes da minimização
+    #
+    # Retorna o AFD só com os estados alcançáveis (na mesma ordem) e a lista com os nomes dos estados removidos
+    n = len(afdc.estados)
+    k = len(afdc.alfa)
+
+    visitado = bytearray(n)
+    visitado[afdc.inicial] = 1
+    fila = [afdc.inicial]
+    for q in fila:  # A lista cresce durante o laço, funcionando como fila
+        for _, destino in afdc.transicoes_de(q):
+            if not visitado[destino]:
+                visitado[destino] = 1
+                fila.append(destino)
+
+    if len(fila) == n: # Todos os estados são alcançáveis: devolve o próprio AFD, sem copiar nada
+        return afdc, []
+
+    # Renumera os estados alcançáveis e refaz as transições só com eles
+    manter = np.frombuffer(bytes(visitado), dtype=np.uint8).astype(bool)
+    novo = np.full(n, -1, dtype=np.int32)
+    novo[manter] = np.arange(len(fila), dtype=np.int32)
+    estados = [afdc.estados[q] for q in range(n) if visitado[q]]
+    finais = bytearray(f for f, v in zip(afdc.finais, visitado) if v)
+    removidos = [afdc.estados[q] for q in range(n) if not visitado[q]]
+
+    if afdc.esparsa is not None:
+        inicio, simbolos, destinos = (np.frombuffer(v, dtype=np.int32) for v in afdc.esparsa)
+        guardadas = np.repeat(manter, np.diff(inicio))
+        quantos = np.diff(inicio)[manter]
+        novo_inicio = np.zeros(len(fila) + 1, dtype=np.int64)
+        np.cumsum(quantos, out=novo_inicio[1:])
+        esparsa = (para_array(novo_inicio), para_array(simbolos[guardadas]), para_array(novo[destinos[guardadas]]))
+        return AFDCompacto(estados, list(afdc.alfa), int(novo[afdc.inicial]), finais, None, esparsa), removidos
+
+    tabela = np.frombuffer(afdc.transicoes, dtype=np.int32).reshape(n, k)[manter]
+    tabela = np.where(tabela >= 0, novo[tabela], -1)
+    return AFDCompacto(estados, list(afdc.alfa), int(novo[afdc.inicial]), finais, para_array(tabela)), removidos
+
+# Nome do estado de erro acrescentado aos AFDs parciais (veja completa_afd)
+NOME_ESTADO_ERRO = '∅'
+
+def completa_afd(afdc):
+    # Num AFD parcial, as transições ausentes levam a um estado de erro implícito: um estado não final, que não aceita nenhuma palavra.
+    # Os arquivos só precisam listar as transições que existem, em vez de um estado "armadilha" escrito à mão com uma transição por símbolo
+    #
+    # O estado de erro entra como o último estado (AFDCompacto.erro), sem nenhuma transição guardada e sem copiar as transições do AFD: as
+    # ausentes passam a ir para ele (veja AFDCompacto.destino e AFDCompacto.linha). Os estados que também não aceitam nenhuma palavra são
+    # equivalentes ao estado de erro e caem no mesmo estado composto do AFD minimizado (exemplo: 'F, ∅'). Se não houver nenhum, o estado
+    # composto fica só com o nome NOME_ESTADO_ERRO
+    #
+    # Retorna o AFD completo e o número de transições ausentes. Se não faltar nenhuma transição, devolve o próprio AFD, e o estado de erro
+    # não aparece no AFD minimizado
+    n = len(afdc.estados)
+    ausentes = n * len(afdc.alfa) - afdc.quantidade_transicoes()
+    if not ausentes:
+        return afdc, 0
+
+    nome = NOME_ESTADO_ERRO
+    while nome in afdc.indice_estado:  # Não pode coincidir com o nome de um estado do AFD
+        nome += "'"
+
+    completo = AFDCompacto(list(afdc.estados) + [nome], list(afdc.alfa), afdc.inicial, afdc.finais + b'\0', afdc.transicoes, afdc.esparsa, n)
+    return completo, ausentes
+
+def agrupa_simbolos(afdc):
+    # Junta em uma classe os símbolos cujas colunas na tabela são iguais, isto é, que levam cada estado ao mesmo destino. Para a minimização,
+    # os símbolos de uma classe são indistinguíveis, então basta olhar um deles: em AFDs com alfabetos grandes (tokenizadores, por exemplo)
+    # quase todos os símbolos caem em poucas classes, e os laços por símbolo dos algoritmos encolhem na mesma proporção
+    #
+    # Retorna um AFD compacto com os mesmos estados e uma coluna por classe, cujo símbolo é o nome dos símbolos da classe separados por ','
+    # (o mesmo separador do arquivo de entrada, então não aparece dentro de um símbolo). Se não houver o que juntar, devolve o próprio AFD
+    k = len(afdc.alfa)
+    n = len(afdc.estados)
+
+    classes = {}  # Coluna da tabela (em bytes) -> símbolos com essa coluna
+    if afdc.esparsa is None:
+        transicoes = afdc.transicoes
+        for c in range(k):
+            classes.setdefault(transicoes[c::k].tobytes(), []).append(c)
+    else:
+        # Na forma esparsa, a coluna de um símbolo é dada pelas transições que existem com ele: os estados de origem e os destinos
+        inicio, simbolos, destinos = (np.frombuffer(v, dtype=np.int32) for v in afdc.esparsa)
+        origens = np.repeat(np.arange(len(inicio) - 1, dtype=np.int32), np.diff(inicio))
+        ordem = np.argsort(simbolos, kind='stable')
+        limites = np.searchsorted(simbolos[ordem], np.arange(k + 1))
+        for c in range(k):
+            coluna = ordem[limites[c]:limites[c + 1]]
+            classes.setdefault((origens[coluna].tobytes(), destinos[coluna].tobytes()), []).append(c)
+
+    if len(classes) == k:
+        return afdc
+
+    representantes = [simbolos[0] for simbolos in classes.values()]
+    alfa = [','.join(afdc.alfa[c] for c in simbolos) for simbolos in classes.values()]
+
+    if afdc.esparsa is None:
+        tabela = np.frombuffer(afdc.transicoes, dtype=np.int32).reshape(-1, k)[:, representantes]
+        return AFDCompacto(afdc.estados, alfa, afdc.inicial, afdc.finais, para_array(tabela), erro=afdc.erro)
+
+    # Só as transições com os representantes continuam, com o símbolo trocado pelo número da classe (as classes estão em ordem de
+    # representante, então as transições de cada estado continuam em ordem de símbolo)
+    classe = np.full(k, -1, dtype=np.int32)
+    classe[representantes] = np.arange(len(representantes), dtype=np.int32)
+    guardadas = classe[simbolos] >= 0
+    novo_inicio = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origens[guardadas], minlength=n)[:n], out=novo_inicio[1:])
+    esparsa = (para_array(novo_inicio), para_array(classe[simbolos[guardadas]]), para_array(destinos[guardadas]))
+    return AFDCompacto(afdc.estados, alfa, afdc.inicial, afdc.finais, None, esparsa, afdc.erro)
+
+def estados_vivos(afdc, inversas=None):
+    # Estados que aceitam alguma palavra, isto é, que chegam a algum estado final: busca em largura a partir dos finais pelas transições
+    # inversas (as de AFDCompacto.inversas, que podem ser passadas em 'inversas' por quem já as tiver). Os outros estados, os "mortos",
+    # são todos equivalentes entre si e ao estado de erro implícito, que também é morto
+    #
+    # Retorna um bytearray com 1 nos estados vivos
+    inicio, _, origens = inversas if inversas is not None else afdc.inversas()
+    vivo = bytearray(afdc.finais)
+    fila = [q for q in range(len(vivo)) if vivo[q]]
+    for q in fila:  # A lista cresce durante o laço, funcionando como fila
+        for p in origens[inicio[q]:inicio[q + 1]]:
+            if not vivo[p]:
+                vivo[p] = 1
+                fila.append(p)
+    return vivo
+
+"""
+=====================
+
+ARQUIVO BINÁRIO
+
+=====================
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+# Formato binário do AFD compacto (.afdb), para recarregar AFDs grandes sem precisar ler o .txt de novo:
+#
+# cabeçalho: assinatura b'AFDB', versão, n (estados), k (símbolos), estado inicial e tamanho em bytes dos nomes
+# nomes: nomes dos n estados seguidos dos k símbolos, em UTF-8 e separados por '\n'
+# finais: n bytes (1 se o estado é final)
+# transições, começando numa posição múltipla de 4 para poder ser mapeadas direto, em inteiros de 32 bits little-endian:
+#   versão 1 (forma densa): a tabela n×k
+#   versão 2 (forma esparsa): inicio (n + 1 inteiros), seguido dos símbolos e dos destinos (inicio[n] inteiros cada)
+ASSINATURA_BINARIO = b'AFDB'
+VERSAO_BINARIO = 1
+VERSAO_BINARIO_ESPARSA = 2
+CABECALHO_BINARIO = struct.Struct('<4sIiiiI')
+
+def salva_afd_binario(afdc, arquivo):
+    n = len(afdc.estados)
+    k = len(afdc.alfa)
+    nomes = '\n'.join(list(afdc.estados) + list(afdc.alfa)).encode('utf-8')
+
+    versao = VERSAO_BINARIO if afdc.esparsa is None else VERSAO_BINARIO_ESPARSA
+    partes = [array('i', parte) for parte in ((afdc.transicoes,) if afdc.esparsa is None else afdc.esparsa)]
+    if sys.byteorder == 'big':
+        for parte in partes:
+            parte.byteswap()
+
+    # Grava num arquivo temporário e renomeia, para uma gravação interrompida (ou outro processo gravando ao mesmo tempo) nunca deixar
+    # um binário pela metade no lugar do cache
+    temporario = f'{arquivo}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(CABECALHO_BINARIO.pack(ASSINATURA_BINARIO, versao, n, k, afdc.inicial, len(nomes)))
+        f.write(nomes)
+        f.write(afdc.finais)
+        f.write(bytes(-(CABECALHO_BINARIO.size + len(nomes) + n) % 4))  # Alinha o início das transições em 4 bytes
+        for parte in partes:
+            f.write(parte)
+    os.replace(temporario, arquivo)
+
+def carrega_afd_binario(arquivo):
+    # Mapeia o arquivo na memória: as transições não são copiadas, o AFD compacto lê direto das páginas do arquivo
+    # O tamanho é conferido antes de mapear: um arquivo vazio não pode ser mapeado (mmap levanta ValueError)
+    with open(arquivo, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < CABECALHO_BINARIO.size:
+            print(f"Erro: O arquivo '{arquivo}' não é um AFD binário válido.")
+            return None
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    assinatura, versao, n, k, inicial, tamanho_nomes = CABECALHO_BINARIO.unpack_from(mapa, 0)
+    if assinatura != ASSINATURA_BINARIO or versao not in (VERSAO_BINARIO, VERSAO_BINARIO_ESPARSA):
+        print(f"Erro: O arquivo '{arquivo}' não é um AFD binário válido.")
+        return None
+
+    # O conteúdo do arquivo também é conferido: relatorio_afd não confere de novo os AFDs compactos, então um binário corrompido ou feito
+    # à mão com um estado inicial ou um destino fora da tabela só quebraria mais tarde, no meio da minimização
+    if n < 1 or k < 0 or not 0 <= inicial < n:
+        print(f"Erro: O arquivo '{arquivo}' tem um cabeçalho inválido (estados: {n}, símbolos: {k}, inicial: {inicial}).")
+        return None
+
+    posicao = CABECALHO_BINARIO.size
+    try:
+        nomes = mapa[posicao:posicao + tamanho_nomes].decode('utf-8').split('\n')
+    except UnicodeDecodeError:
+        nomes = []
+    if len(nomes) != n + k or len(set(nomes[:n])) != n or len(set(nomes[n:])) != k:
+        print(f"Erro: O arquivo '{arquivo}' não tem {n} estados e {k} símbolos com nomes distintos.")
+        return None
+    posicao += tamanho_nomes
+
+    finais = bytearray(mapa[posicao:posicao + n])
+    posicao += n + (-posicao - n) % 4
+
+    def inteiros(comeco, quantidade):
+        # 'quantidade' inteiros de 32 bits a partir de 'comeco' (None se o arquivo terminar antes)
+        if quantidade < 0 or len(mapa) < comeco + 4 * quantidade:
+            return None
+        if sys.byteorder == 'little':
+            return memoryview(mapa)[comeco:comeco + 4 * quantidade].cast('i')
+        valores = array('i', mapa[comeco:comeco + 4 * quantidade])
+        valores.byteswap()
+        return valores
+
+    if versao == VERSAO_BINARIO:
+        transicoes = inteiros(posicao, n * k)
+        if transicoes is None:
+            print(f"Erro: O arquivo '{arquivo}' está truncado.")
+            return None
+        if finais.translate(None, b'\0\1') or (n * k and not -1 <= min(transicoes) <= max(transicoes) < n):
+            print(f"Erro: O arquivo '{arquivo}' tem estados finais ou destinos de transições fora dos estados do AFD.")
+            return None
+        return AFDCompacto(nomes[:n], nomes[n:n + k], inicial, finais, transicoes)
+
+    inicio = inteiros(posicao, n + 1)
+    m = inicio[n] if inicio is not None else 0
+    simbolos = inteiros(posicao + 4 * (n + 1), m)
+    destinos = inteiros(posicao + 4 * (n + 1 + m), m)
+    if inicio is None or simbolos is None or destinos is None:
+        print(f"Erro: O arquivo '{arquivo}' está truncado.")
+        return None
+
+    # Na forma esparsa, as transições de cada estado também precisam estar no lugar certo: inicio crescente a partir de 0 e, em cada
+    # estado, os símbolos em ordem estritamente crescente (sem transições repetidas)
+    vetor_inicio = np.frombuffer(inicio, dtype=np.int32)
+    vetor_simbolos = np.frombuffer(simbolos, dtype=np.int32)
+    crescentes = np.diff(vetor_simbolos) > 0
+    crescentes[vetor_inicio[1:-1][(vetor_inicio[1:-1] > 0) & (vetor_inicio[1:-1] < m)] - 1] = True  # A troca de estado pode voltar o símbolo
+    if finais.translate(None, b'\0\1') or inicio[0] != 0 or np.any(np.diff(vetor_inicio) < 0) or not crescentes.all() \
+            or (m and not (0 <= min(simbolos) and max(simbolos) < k and 0 <= min(destinos) and max(destinos) < n)):
+        print(f"Erro: O arquivo '{arquivo}' tem estados finais ou transições fora dos estados e símbolos do AFD.")
+        return None
+    return AFDCompacto(nomes[:n], nomes[n:n + k], inicial, finais, None, (inicio, simbolos, destinos))
 
 """
 =====================
@@ -133,10 +837,36 @@ EXIBIR DIAGRAMA
 =====================
 """
 
-from graphviz import Digraph
+import threading
+
+from graphviz import CalledProcessError, Digraph, ExecutableNotFound
+
+# Formas de gerar o diagrama:
+#
+# 'janela': desenha o diagrama e abre o visualizador, esperando o Graphviz terminar (o comportamento original)
+# 'fundo': desenha e abre o visualizador numa thread, sem atrasar o resto da execução (o programa só termina depois que o desenho acabar)
+# 'dot': só grava o arquivo .gv, sem calcular o layout (pode ser desenhado depois com o comando dot)
+# 'nenhum': não gera nada
+MODOS_DIAGRAMA = ('janela', 'fundo', 'dot', 'nenhum')
 
-def exibir_diagrama_afd(afd, nome_arquivo):
-    # Cria o arquivo de exibição do AFD a partir da biblioteca Graphviz
+# Acima desse número de estados o layout do Graphviz pode levar minutos, então o desenho é trocado por um resumo do AFD (o modo 'dot' não tem limite)
+LIMITE_DIAGRAMA = 300
+
+def exibir_diagrama_afd(afd, nome_arquivo, modo='janela', limite=LIMITE_DIAGRAMA):
+    # Cria o arquivo de exibição do AFD (estrutura de dicionários ou AFD compacto) a partir da biblioteca Graphviz, da forma indicada por 'modo'
+    # (veja MODOS_DIAGRAMA). Com limite=None, desenha AFDs de qualquer tamanho
+    #
+    # No modo 'fundo', retorna a thread que está desenhando, para quem precisar esperar por ela; nos outros, retorna None
+    if modo == 'nenhum':
+        return None
+
+    quantidade = len(afd.estados) if isinstance(afd, AFDCompacto) else len(afd['estados'])
+    if modo != 'dot' and limite is not None and quantidade > limite:
+        mostra_resumo_afd(afd, nome_arquivo, limite)
+        return None
+
+    if isinstance(afd, AFDCompacto):
+        afd = afd.para_dict()
 
     dot = Digraph(comment=nome_arquivo)
 
@@ -151,8 +881,9 @@ def exibir_diagrama_afd(afd, nome_arquivo):
     dot.node('inicio', '', shape='point')  # Um ponto invisível para representar a entrada
     
     # Adiciona estados
+    finais = set(afd['finais'])
     for estado in afd['estados']:
-        if estado in afd['finais']:
+        if estado in finais:
             dot.node(str(estado), str(estado), shape='doublecircle')  # Estados finais com círculo duplo
         else:
             dot.node(str(estado), str(estado))
@@ -181,7 +912,236 @@ def exibir_diagrama_afd(afd, nome_arquivo):
             dot.edge(origem_str, destino_str, label=label)
     
     # Gera o arquivo
-    dot.render(f'{nome_arquivo}.gv', view=True)
+    if modo == 'dot':
+        dot.save(f'{nome_arquivo}.gv')
+        return None
+    if modo == 'fundo':
+        desenho = threading.Thread(target=desenha_diagrama, args=(dot, nome_arquivo), name=f'diagrama {nome_arquivo}')
+        desenho.start()
+        return desenho
+    desenha_diagrama(dot, nome_arquivo)
+    return None
+
+def desenha_diagrama(dot, nome_arquivo):
+    # Calcula o layout, grava o PDF e abre o visualizador. Roda também dentro da thread do modo 'fundo', então os erros do Graphviz viram uma mensagem
+    try:
+        dot.render(f'{nome_arquivo}.gv', view=True)
+    except (ExecutableNotFound, CalledProcessError) as erro:
+        print(f"Erro ao desenhar o diagrama '{nome_arquivo}': {erro}")
+
+def mostra_resumo_afd(afd, nome_arquivo, limite):
+    # Resumo em texto do AFD, no lugar de um diagrama grande demais para o Graphviz
+    if isinstance(afd, AFDCompacto):
+        estados, finais = len(afd.estados), sum(afd.finais)
+        transicoes = afd.quantidade_transicoes()
+    else:
+        estados, finais = len(afd['estados']), len(afd['finais'])
+        transicoes = sum(len(transicoes_origem) for transicoes_origem in afd['transicoes'].values())
+
+    print(f"Diagrama '{nome_arquivo}' não desenhado: o AFD tem {estados} estados (limite: {limite}). Use o modo 'dot' para gravar só o arquivo .gv.")
+    print(f"Resumo: {estados} estados ({finais} finais), {len(afd.alfa if isinstance(afd, AFDCompacto) else afd['alfa'])} símbolos e {transicoes} transições.")
+
+"""
+=====================
+
+PASSO-A-PASSO
+
+=====================
+"""
+
+# Níveis de detalhe da execução:
+#
+# 'silencioso': nenhum evento é gerado (uso em produção)
+# 'resumo': só os eventos de resumo (etapas e contagens)
+# 'passo': todos os eventos, inclusive um por par de estados e por símbolo (a explicação completa do algoritmo)
+NIVEIS_RASTRO = ('silencioso', 'resumo', 'passo')
+
+class Rastro:
+    # Recebe os eventos estruturados da execução dos algoritmos (dicionários com a chave 'evento' e os dados de cada passo)
+    # e os entrega a um destino, que por padrão imprime a explicação em texto
+    #
+    # Os algoritmos só montam os eventos de cada par ou símbolo quando 'detalhado' é verdadeiro, e não montam nada quando
+    # recebem rastro=None, então uma execução silenciosa não formata nem escreve nada por par de estados
+    #
+    # Os eventos de matriz levam uma cópia dos bits da MatrizTriangular naquele passo (bytes), então um destino pode guardar os eventos
+    # para exibir depois ou serializá-los; MatrizTriangular.de_bits remonta a matriz a partir da cópia. Durante a primeira etapa, eles
+    # também levam 'preenchidos', o número de pares já comparados (os demais aparecem com -1, veja mostra_matriz)
+
+    __slots__ = ('detalhado', 'destino')
+
+    def __init__(self, nivel='passo', destino=None):
+        self.detalhado = nivel == 'passo'
+        self.destino = destino if destino is not None else imprime_evento
+
+    def __call__(self, evento):
+        self.destino(evento)
+
+def cria_rastro(nivel, destino=None):
+    # Devolve o rastro do nível pedido, ou None para o nível 'silencioso'
+    if nivel == 'silencioso':
+        return None
+    return Rastro(nivel, destino)
+
+def imprime_evento(evento):
+    # Converte um evento no texto explicativo do passo-a-passo e o imprime
+    tipo = evento['evento']
+
+    if tipo == 'afd_valido':
+        print("AFD válido!")
+
+    elif tipo == 'inalcancaveis':
+        removidos = evento['removidos']
+        if not removidos:
+            print('Todos os estados são alcançáveis a partir do estado inicial.')
+        else:
+            # Em AFDs grandes, mostra só os primeiros nomes
+            nomes = ', '.join(removidos[:10]) + (', ...' if len(removidos) > 10 else '')
+            print(f'{len(removidos)} estado(s) inalcançável(is) a partir do estado inicial removido(s): {nomes}')
+            print(f'A minimização continua com os {evento["restantes"]} estados restantes.')
+
+    elif tipo == 'estado_erro':
+        print(f'O AFD é parcial: {evento["ausentes"]} transição(ões) ausente(s) vão para o estado de erro {evento["estado"]}, que não aceita nenhuma palavra.')
+        print('Os estados que também não aceitam nenhuma palavra serão condensados com ele.')
+
+    elif tipo == 'classes_simbolos':
+        print(f'Os {evento["simbolos"]} símbolos do alfabeto foram agrupados em {evento["classes"]} classes de símbolos com as mesmas transições:')
+        # Em alfabetos grandes, mostra só as primeiras classes
+        for classe in evento['nomes'][:10]:
+            print(f'  {{{classe}}}')
+        if len(evento['nomes']) > 10:
+            print('  ...')
+
+    elif tipo == 'etapa':
+        titulos = {
+            1: 'PRIMEIRA ETAPA DO ALGORITMO DE MYHILL-NERODE',
+            2: 'SEGUNDA ETAPA DO ALGORITMO DE MYHILL-NERODE',
+            3: 'TERCEIRA ETAPA DO ALGORITMO MYHILL NERODE'
+        }
+        print('=' * 50)
+        print(f'\n{titulos[evento["numero"]]}\n')
+        print('=' * 50)
+        if evento['numero'] == 2:
+            print('Propagando as marcas da matriz pelas transições inversas:\n')
+        elif evento['numero'] == 3:
+            print('Agora, vamos minimizar o AFD condensando alguns estados em um só.')
+            print('Basta verificar os pares de estados não marcados na matriz')
+            print('Se eles possuem estados em comum, eles serão condensados em um só.\n')
+
+    elif tipo == 'matriz':
+        if evento['titulo']:
+            print(evento['titulo'])
+        if evento['compacta']:
+            mostra_diagonal_inferior(MatrizTriangular.de_bits(len(evento['estados']), evento['matriz']), evento['estados'])
+        else:
+            mostra_matriz(MatrizTriangular.de_bits(len(evento['estados']), evento['matriz']), evento['estados'], evento.get('preenchidos'))
+
+    elif tipo == 'comparacao':
+        print('-' * 50)
+        print(f'Passo {evento["passo"]}: comparando o estado {evento["i"]} e o estado {evento["j"]}\n')
+        if evento['i'] == evento['j']:
+            print('Os estados são iguais, então ignoramos.')
+            return
+        print(f'O estado {evento["i"]} {"é" if evento["final_i"] else "não é"} final e o', end=" ")
+        print(f'estado {evento["j"]} {"é" if evento["final_j"] else "não é"} final')
+        if evento['motivo'] == 'morto':
+            morto, vivo = (evento['i'], evento['j']) if not evento['vivo_i'] else (evento['j'], evento['i'])
+            print(f'O estado {morto} não aceita nenhuma palavra (não chega a nenhum estado final) e o estado {vivo} aceita')
+        elif evento['motivo'] == 'simbolos':
+            print('Os dois aceitam alguma palavra, mas com algum símbolo só um deles vai para um estado que ainda aceita alguma palavra')
+        print(f'Logo, a posição {evento["i"]}x{evento["j"]} recebe um {1 if evento["marcado"] else 0}, matriz atualizada:')
+        mostra_matriz(MatrizTriangular.de_bits(len(evento['estados']), evento['matriz']), evento['estados'], evento['preenchidos'])
+
+    elif tipo == 'marcacao_inicial':
+        print(f'\n{evento["marcados"]} de {evento["pares"]} pares de estados marcados na primeira etapa.\n')
+
+    elif tipo == 'par_propagado':
+        print('-' * 50)
+        print(f'Passo {evento["passo"]}: o par de estados {evento["i"]} e {evento["j"]} está marcado, procurando pares que chegam nele lendo um mesmo símbolo\n')
+
+    elif tipo == 'par_marcado':
+        print(f'{evento["p"]} lendo {evento["simbolo"]} vai para {evento["i"]} e {evento["q"]} lendo {evento["simbolo"]} vai para {evento["j"]}')
+        print(f'Como o par {evento["i"]} e {evento["j"]} está marcado, o par {evento["p"]} e {evento["q"]} também será marcado.\n')
+
+    elif tipo == 'propagacao':
+        print(f'\n{evento["marcados"]} pares de estados marcados na segunda etapa.\n')
+
+    elif tipo == 'par_condensado':
+        print(f'O par {evento["i"]} e {evento["j"]} foi marcado com 0, então eles serão condensados')
+
+    elif tipo == 'estados_isolados':
+        print(f'\nO(s) estado(s) isolado(s) é(são): {evento["estados"]}')
+
+    elif tipo == 'estado_inicial':
+        print(f'\nO estado inicial {evento["original"]} faz parte do estado composto {evento["composto"]}')
+        print(f'então {evento["composto"]} será estado inicial do AFD minimizado.')
+
+    elif tipo == 'estado_final':
+        print(f'\nO estado final {evento["original"]} faz parte do estado composto {evento["composto"]}, ')
+        print(f'então {evento["composto"]} será final no AFD minimizado.')
+
+    elif tipo == 'condensacao':
+        print(f'\n{evento["antes"]} estados do AFD original foram condensados em {evento["depois"]} estados.\n')
+
+    elif tipo == 'transicao':
+        print('-' * 50)
+        print(f"Preenchendo transição: {evento['origem']} --{evento['simbolo']}--> {evento['destino']}")
+        print(f"Explicação: O estado {evento['origem']} contém o estado {evento['representante']} do AFD original.")
+        print(f"Para o símbolo '{evento['simbolo']}', o estado {evento['representante']} transita para {evento['destino_original']} no AFD original.")
+        print(f"Portanto, no AFD minimizado, o estado {evento['origem']} transita para {evento['destino']} com o símbolo '{evento['simbolo']}'.\n")
+
+    elif tipo == 'minimizacao':
+        print(f'Minimização por {evento["metodo"]}: {evento["antes"]} estados -> {evento["depois"]} estados' +
+              (f' em {evento["rodadas"]} rodadas.' if 'rodadas' in evento else '.'))
+
+    elif tipo == 'cache':
+        print(f'AFD já minimizado antes (hash {evento["chave"][:12]}): {evento["estados"]} estados -> {evento["blocos"]} estados, reaproveitados do cache.')
+
+"""
+=====================
+
+ESTATÍSTICAS
+
+=====================
+"""
+
+import time
+
+class Estatisticas:
+    # Tempos e contadores de uma minimização, para ver onde o tempo foi gasto e achar entradas patológicas
+    #
+    # Os algoritmos recebem estatisticas=None por padrão e, nesse caso, não medem nem contam nada. Com um objeto Estatisticas, cada fase
+    # conta em variáveis locais (ou deduz a contagem dos tamanhos que já conhece) e soma aqui uma única vez, no fim da fase
+    #
+    # 'gancho', se dado, é chamado no fim de cada fase com (fase, segundos, estatisticas), por exemplo para mandar as medidas a um sistema de métricas
+
+    __slots__ = ('tempos', 'estados_antes', 'estados_alcancaveis', 'estados_depois', 'classes_simbolos', 'pares_examinados', 'pares_marcados',
+                 'transicoes_seguidas', 'fusoes', 'divisoes', 'rodadas', 'gancho')
+
+    def __init__(self, gancho=None):
+        self.tempos = {}              # Segundos de cada fase, na ordem em que rodaram
+        self.estados_antes = 0        # Estados do AFD recebido
+        self.estados_alcancaveis = 0  # Estados que sobraram depois de remover os inalcançáveis
+        self.estados_depois = 0       # Estados do AFD minimizado
+        self.classes_simbolos = 0     # Classes de símbolos usadas pelos algoritmos (veja agrupa_simbolos)
+        self.pares_examinados = 0     # Pares de estados consultados na matriz
+        self.pares_marcados = 0       # Pares marcados como distinguíveis
+        self.transicoes_seguidas = 0  # Transições (diretas ou inversas) percorridas
+        self.fusoes = 0               # Uniões de estados feitas na condensação
+        self.divisoes = 0             # Blocos criados por divisão (Hopcroft)
+        self.rodadas = 0              # Rodadas de refinamento (Moore)
+        self.gancho = gancho
+
+    def fase(self, nome, inicio):
+        # Fecha a fase 'nome', que começou no instante 'inicio' (de time.perf_counter)
+        segundos = time.perf_counter() - inicio
+        self.tempos[nome] = self.tempos.get(nome, 0.0) + segundos
+        if self.gancho is not None:
+            self.gancho(nome, segundos, self)
+
+    def para_dict(self):
+        medidas = {nome: getattr(self, nome) for nome in self.__slots__ if nome != 'gancho'}
+        medidas['tempos'] = dict(self.tempos)
+        return medidas
 
 """
 =====================
@@ -191,309 +1151,1333 @@ CÓDIGO PRINCIPAL
 =====================
 """
 
-def mostra_matriz(matriz):
+# Pares da matriz varridos de uma vez na segunda etapa do Table Filling Method (múltiplo de 8, para cada pedaço começar num byte)
+PEDACO_PROPAGACAO = 1 << 14
+# Máximo de pares de origens montados de uma vez ao propagar um pedaço de pares, para a memória não depender do grau de entrada dos estados
+LIMITE_ORIGENS = 1 << 14
+
+
+class MatrizTriangular:
+    # Matriz de pares de estados do Table Filling Method guardada como bits: como o par (i, j) é o mesmo par (j, i) e a diagonal
+    # principal é ignorada, basta guardar a diagonal inferior, com um bit por par (1 = marcado, 0 = não marcado)
+    #
+    # O par (i, j), com i > j, fica no bit i*(i-1)/2 + j, e a matriz inteira ocupa cerca de n²/16 bytes
+
+    __slots__ = ('n', 'bits')
+
+    def __init__(self, n):
+        self.n = n
+        self.bits = bytearray((n * (n - 1) // 2 + 7) // 8)
+
+    def marcado(self, i, j):
+        if i < j:
+            i, j = j, i
+        posicao = i * (i - 1) // 2 + j
+        return (self.bits[posicao >> 3] >> (posicao & 7)) & 1
+
+    def marca(self, i, j):
+        if i < j:
+            i, j = j, i
+        posicao = i * (i - 1) // 2 + j
+        self.bits[posicao >> 3] |= 1 << (posicao & 7)
+
+    @classmethod
+    def de_bits(cls, n, bits):
+        # Remonta a matriz de n estados a partir de uma cópia dos bits (a que vai nos eventos do passo-a-passo)
+        matriz = cls(n)
+        matriz.bits[:] = bits
+        return matriz
+
+def pares_matriz(posicoes):
+    # Volta das posições dos bits da MatrizTriangular (array NumPy) para os pares (i, j), com i > j. A raiz em ponto flutuante pode errar
+    # por um perto dos quadrados perfeitos, então o resultado é corrigido com a conta exata
+    posicoes = posicoes.astype(np.int64)
+    i = ((1 + np.sqrt(1 + 8 * posicoes.astype(np.float64))) // 2).astype(np.int64)
+    i -= i * (i - 1) // 2 > posicoes
+    i += i * (i + 1) // 2 <= posicoes
+    return i, posicoes - i * (i - 1) // 2
+
+def mostra_matriz(matriz, estados, preenchidos=None):
+    # Com 'preenchidos', só os pares nas primeiras 'preenchidos' posições da matriz (na ordem em que a primeira etapa os compara) já têm
+    # valor: os outros ainda não foram comparados e aparecem com -1, como na matriz inicial
     
     # Imprime os cabeçalhos das colunas
     print('   ', end='')
-    for estado in matriz:
+    for estado in estados:
         print(f'{estado:>2} ', end='') # Imprime o nome do estado com alinhamento à direita
     print()
 
     # Imprime a matriz linha por linha
-    for estado in matriz:
+    for i, estado in enumerate(estados):
         print(f'{estado:>2} ', end='') # Imprime o nome do estado na linha atual
-        for estado_destino in matriz[estado]:
-            # Imprime o valor da matriz na posição [estado][estado_destino] com alinhamento à direita
-            print(f'{matriz[estado][estado_destino]:>2} ', end='')
+        for j in range(len(estados)):
+            # Imprime o valor da matriz na posição [estado][estado_destino] com alinhamento à direita. As células da diagonal principal para cima são ignoradas pelo algoritmo e aparecem com -1
+            preenchido = j < i and (preenchidos is None or i * (i - 1) // 2 + j < preenchidos)
+            print(f'{matriz.marcado(i, j) if preenchido else -1:>2} ', end='')
         print() # Pula para a próxima linha
 
-def mostra_diagonal_inferior(matriz):
+def mostra_diagonal_inferior(matriz, estados):
     # Imprime os cabeçalhos das colunas
     print('   ', end='')
-    for estado in matriz:
+    for estado in estados:
         print(f'{estado:>2} ', end='') # Imprime o nome do estado com alinhamento à direita
     print()
     # Imprime apenas os elementos da diagonal inferior da matriz
-    for estado in matriz:
+    for i, estado in enumerate(estados):
         print(f'{estado:>2} ', end='') # Imprime o nome do estado na linha atual
-        for estado_destino in matriz[estado]:
-            if estado_destino < estado:
+        for j in range(len(estados)):
+            if j < i:
                 # Imprime o valor da matriz na posição [estado][estado_destino] se estiver na diagonal inferior
-                print(f'{matriz[estado][estado_destino]:>2} ', end='')
+                print(f'{matriz.marcado(i, j):>2} ', end='')
             else:
                 # Imprime espaços em branco para manter o alinhamento
                 print('   ', end='')
         print() # Pula para a próxima linha
 
-def preenche_matriz_inicial(afd, matriz):
-    # Percorre toda a matriz, mantendo os elementos da diagonal principal para cima com -1 (que serão ignorados no algoritmo), e adicionando 0 ou 1:
+def preenche_matriz_inicial(afdc, matriz, rastro=None, estatisticas=None):
+    # Percorre a diagonal inferior da matriz (os elementos da diagonal principal para cima são ignorados no algoritmo), marcando os pares:
+    #
+    # Marca com 1 a célula caso um, e somente um, de seus estados seja um estado final
     #
-    # Adiciona 1 na célula caso um, e somente um, de seus estados seja um estado final
+    # Num AFD parcial (com o estado de erro implícito), marca também com 1 a célula caso só um dos estados aceite alguma palavra (o outro é
+    # "morto", como o estado de erro), ou caso os dois aceitem mas, com algum símbolo, só um deles vá para um estado que ainda aceita alguma
+    # palavra: a segunda etapa marcaria esses pares de qualquer forma, e assim ela não precisa seguir as transições ausentes
     #
-    # Adiciona 0 na célula caso os dois sejam estados não-finais ou os dois sejam estados finais
+    # Deixa com 0 a célula nos demais casos
+    inicio = time.perf_counter() if estatisticas is not None else 0.0
+    estados = afdc.estados
+    finais = afdc.finais
+    detalhado = rastro is not None and rastro.detalhado
+
+    # Grupo de cada estado: -1 nos mortos e, nos vivos, um número para cada conjunto de símbolos com que o estado vai para um estado vivo.
+    # Num AFD completo, todos contam como vivos e ficam no mesmo grupo, e a primeira etapa é só a do algoritmo original
+    vivo = estados_vivos(afdc) if afdc.erro >= 0 else bytearray(b'\1') * len(estados)
+    grupos = {}
+    grupo = [grupos.setdefault(tuple(c for c, destino in afdc.transicoes_de(q) if vivo[destino]), len(grupos)) if vivo[q] else -1
+             for q in range(len(estados))]
+
+    marcados = 0
     passo = 0 
-    for i in afd['estados']:
-        for j in afd['estados']:
+    for i in range(len(estados)):
+        for j in range(i):
+            # Se o par de estados contiver exclusivamente um estado final (ou for separado pelos grupos), a matriz é marcada com 1. Caso contrário, continua com 0
+            marcado = finais[i] != finais[j] or grupo[i] != grupo[j]
+            if marcado:
+                matriz.marca(i, j)
+                marcados += 1
+
+            if detalhado:
+                passo += 1
+                motivo = 'final' if finais[i] != finais[j] else 'morto' if vivo[i] != vivo[j] else 'simbolos' if marcado else None
+                rastro({'evento': 'comparacao', 'passo': passo, 'i': estados[i], 'j': estados[j], 'final_i': finais[i], 'final_j': finais[j],
+                        'vivo_i': vivo[i], 'vivo_j': vivo[j], 'motivo': motivo, 'marcado': marcado, 'matriz': bytes(matriz.bits), 'estados': estados,
+                        'preenchidos': i * (i - 1) // 2 + j + 1})
+
+        if detalhado: # O passo em que o estado é comparado com ele mesmo fecha a linha da matriz
             passo += 1
-            print('-' * 50)
-            print(f'Passo {passo}: comparando o estado {i} e o estado {j}\n')
-            if i == j:
-                print('Os estados são iguais, então ignoramos.')
-                break
-
-            # Se o par de estados contiver exclusivamente um estado final, a matriz é marcada com 1
-            if (i in afd['finais']) != (j in afd['finais']):
-                print(f'O estado {i} {'é' if i in afd['finais'] else 'não é'} final e o', end=" ")
-                print(f'estado {j} {'é' if j in afd['finais'] else 'não é'} final')
-                print(f'Logo, a posição {i}x{j} recebe um 1, matriz atualizada:')
-                matriz[i][j] = 1
-            # Caso contrário, é marcada com 0
-            else:
-                print(f'O estado {i} {'é' if i in afd['finais'] else 'não é'} final e o', end=" ")
-                print(f'estado {j} {'é' if j in afd['finais'] else 'não é'} final')
-                print(f'Logo, a posição {i}x{j} recebe um 0, matriz atualizada:')
-                matriz[i][j] = 0
-            mostra_matriz(matriz)
-
-def deriva_estados_matriz(afd, matriz):
-    print('=' * 50)
-    print('\nSEGUNDA ETAPA DO ALGORITMO DE MYHILL-NERODE\n')
-    print('=' * 50)
-
-    print('Derivando os pares de estados não marcados na matriz:\n')
+            rastro({'evento': 'comparacao', 'passo': passo, 'i': estados[i], 'j': estados[i]})
+
+    if rastro:
+        rastro({'evento': 'marcacao_inicial', 'marcados': marcados, 'pares': len(estados) * (len(estados) - 1) // 2})
+
+    if estatisticas is not None:
+        estatisticas.pares_examinados += len(estados) * (len(estados) - 1) // 2
+        estatisticas.pares_marcados += marcados
+        estatisticas.fase('preenche_matriz_inicial', inicio)
+
+def deriva_estados_matriz(afdc, matriz, rastro=None, estatisticas=None):
+    inicio_fase = time.perf_counter() if estatisticas is not None else 0.0
+    if rastro:
+        rastro({'evento': 'etapa', 'numero': 2})
+
     # Segunda etapa
+    #
+    # Em vez de varrer a matriz inteira várias vezes até nada mudar, parte dos pares já marcados e anda pelas transições ao contrário:
+    # se p lendo um símbolo vai para i e q lendo o mesmo símbolo vai para j, e o par (i, j) está marcado, então o par (p, q) também é marcado.
+    # Cada par marcado é propagado uma única vez, e ao final a matriz está no ponto fixo do algoritmo
+    #
+    # A própria matriz serve de fila: um cursor percorre os bits uma única vez, em pedaços de PEDACO_PROPAGACAO pares, e propaga os pares
+    # marcados de cada pedaço de uma vez, com NumPy (os marcados à frente do cursor durante a varredura são propagados quando ele chegar lá).
+    # Só os pares marcados atrás do cursor, que ele não veria mais, vão para uma pilha, guardados pela posição do bit (i*(i-1)/2 + j), então
+    # a memória fica perto dos n²/16 bytes da matriz. No passo-a-passo, os pares de cada pedaço são propagados um a um, na ordem dos eventos
+    estados = afdc.estados
+    detalhado = rastro is not None and rastro.detalhado
+
+    # Transições inversas: as transições que chegam em q são as posições inicio[q]:inicio[q + 1] de 'simbolos' e 'origens', em ordem de símbolo
+    inversas = afdc.inversas()
+    inicio, simbolos, origens = (np.frombuffer(v, dtype=np.int32).astype(np.int64) for v in inversas)
+    k = max(len(afdc.alfa), 1)
+
+    # Num AFD parcial, os pares com um estado morto já foram resolvidos na primeira etapa (veja preenche_matriz_inicial) e não são
+    # propagados: assim, as transições para os estados mortos (inclusive as ausentes, que vão para o estado de erro implícito) nunca são seguidas
+    vivo = np.ones(len(estados), dtype=bool)
+    if afdc.erro >= 0:
+        vivo = np.frombuffer(bytes(estados_vivos(afdc, inversas)), dtype=np.uint8).astype(bool)
+
+    bits = np.frombuffer(matriz.bits, dtype=np.uint8)  # Enxerga os bits da matriz como array NumPy, sem copiar: as marcas vão direto para a matriz
+    total = len(estados) * (len(estados) - 1) // 2
+    cursor = 0  # Próxima posição da matriz a ser varrida
+    pilha = []  # Posições dos pares marcados atrás do cursor, ainda por propagar (um array por pedaço)
+
+    contar = estatisticas is not None
+    examinados = 0
+    seguidas = 0
+    marcados = 0
     passo = 0
-    for i in afd['estados']:
-        for j in afd['estados']:
-            passo += 1
-            print('-' * 50)
-            if (i == j): # Ignora a diagonal principal para cima
-                print(f'Passo {passo}: Os estados {i} e {j} são iguais, então ignoramos.')
-                break
-            if matriz[i][j] == 1:
-                print(f'Passo {passo}: O par de estados {i} e {j} já está marcado na matriz, então ignoramos.')
-                continue
-            if matriz[i][j] == 0: # Se o par de estados não estiver marcado na matriz, fará a derivação
-                print(f'Passo {passo}: Derivando o par de estados {i} e {j}\n')
-                for simbo in afd['alfa']: # Faz a transição de cada estado do par para cada símbolo do alfabeto
-                    q1 = afd['transicoes'][i][simbo]
-                    q2 = afd['transicoes'][j][simbo]
-                    print(f'{i} lendo {simbo} vai para {q1}')
-                    print(f'{j} lendo {simbo} vai para {q2}\n')
-                    if (matriz[q1][q2] == 1): # Se o par gerado estiver marcado na matriz, o par original também será marcadao
-                        matriz[i][j] = 1
-                        print(f'O par de estados {i} e {j} com o simbolo {simbo} foi derivado para o par de estados {q1} e {q2}')
-                        print(f'que está marcado na matriz, então o par {i} e {j} também será marcado.\n')
-                        continue
-                    elif (matriz[q1][q2] != 1): # Se o par gerado não estiver marcado na matriz, imprime uma mensagem
-                        print(f'O par de estados {i} e {j} com o simbolo {simbo} foi derivado para o par de estados {q1} e {q2}')
-                        print(f'que não está marcado na matriz, então o par {i} e {j} não será marcado.\n')
-                        continue
-                    if (matriz[q2][q1] == 1): # Como a maior parte da matriz é ignorada, é necessário testar o par ao contrário também
-                        matriz[i][j] = 1
-                        print(f'O par de estados {i} e {j} com o simbolo {simbo} foi derivado para o par de estados {q1} e {q2}')
-                        print(f'que está marcado na matriz, então o par {i} e {j} também será marcado.\n')
-                        continue
-                    elif (matriz[q2][q1] != 1): # Se o par gerado não estiver marcado na matriz, imprime uma mensagem
-                        print(f'O par de estados {i} e {j} com o simbolo {simbo} foi derivado para o par de estados {q1} e {q2}')
-                        print(f'que não está marcado na matriz, então o par {i} e {j} não será marcado.\n')
-                        continue
-
-def condensa_estados(afd, matriz):
 
-    estadosAfdMin = [] # Array de arrays de string. Cada um dos sub-arrays representa um dos estados do AFD minimizado (que são estados compostos por estados do AFD original, exemplo: (C, D, E))
+    def chegadas(estados_par):
+        # Transições que chegam em cada estado dado, como (número do estado na lista, posição da transição em 'simbolos' e 'origens')
+        quantos = inicio[estados_par + 1] - inicio[estados_par]
+        dono = np.repeat(np.arange(len(estados_par)), quantos)
+        return dono, inicio[estados_par][dono] + np.arange(len(dono)) - np.repeat(np.cumsum(quantos) - quantos, quantos)
+
+    def propaga(posicoes):
+        # Marca os pares de origens dos pares nas posições dadas (só os de estados vivos), em lotes de até LIMITE_ORIGENS transições inversas
+        i, j = pares_matriz(posicoes)
+        vivos = vivo[i] & vivo[j]
+        i, j = i[vivos], j[vivos]
+        acumulado = np.cumsum(inicio[i + 1] - inicio[i] + inicio[j + 1] - inicio[j])
+        comeco = 0
+        while comeco < len(i):
+            base = int(acumulado[comeco - 1]) if comeco else 0
+            fim = max(comeco + 1, int(np.searchsorted(acumulado, base + LIMITE_ORIGENS, side='right')))
+            propaga_lote(i[comeco:fim], j[comeco:fim])
+            comeco = fim
+
+    def propaga_lote(i, j):
+        nonlocal examinados, seguidas, marcados
+        # As transições que chegam em i e em j, com a chave (número do par, símbolo): as duas listas ficam em ordem de chave, então para
+        # cada transição que chega em i, as que chegam em j lendo o mesmo símbolo formam uma faixa contígua, encontrada com searchsorted
+        par_i, chegada_i = chegadas(i)
+        par_j, chegada_j = chegadas(j)
+        chave_i = par_i * k + simbolos[chegada_i]
+        chave_j = par_j * k + simbolos[chegada_j]
+        comeco = np.searchsorted(chave_j, chave_i, side='left')
+        quantos = np.searchsorted(chave_j, chave_i, side='right') - comeco  # Pares de origens (p, q) de cada transição que chega em i
+        acumulado = np.cumsum(quantos)
+        soma = int(acumulado[-1]) if len(acumulado) else 0
+        if contar: # Cada par de origens é um par examinado, e as transições que chegam em i e em j são as transições inversas seguidas
+            examinados += soma
+            seguidas += len(chegada_i) + len(chegada_j)
+
+        for inicio_lote in range(0, soma, LIMITE_ORIGENS):
+            # O par de origens número e vem da transição t que chega em i, combinada com a transição comeco[t] + r que chega em j
+            e = np.arange(inicio_lote, min(inicio_lote + LIMITE_ORIGENS, soma))
+            t = np.searchsorted(acumulado, e, side='right')
+            r = e - (acumulado[t] - quantos[t])
+            p = origens[chegada_i[t]]
+            q = origens[chegada_j[comeco[t] + r]]
+            diferentes = p != q
+            t, p, q = t[diferentes], p[diferentes], q[diferentes]
+
+            # Só os pares ainda não marcados: marca e, se o cursor já passou por eles, guarda na pilha para propagar a marca
+            maior, menor = np.maximum(p, q), np.minimum(p, q)
+            novos, primeiros = np.unique(maior * (maior - 1) // 2 + menor, return_index=True)
+            nao_marcados = ((bits[novos >> 3] >> (novos & 7)) & 1) == 0
+            novos, primeiros = novos[nao_marcados], primeiros[nao_marcados]
+            if not len(novos):
+                continue
+            np.bitwise_or.at(bits, novos >> 3, np.left_shift(1, novos & 7).astype(np.uint8))
+            marcados += len(novos)
+            atras = novos[novos < cursor]
+            if len(atras):
+                pilha.append(atras)
+
+            if detalhado:
+                origem_i, origem_j = estados[i[0]], estados[j[0]]  # No passo-a-passo, é um par por vez
+                c = simbolos[chegada_i[t[primeiros]]]
+                ordem = primeiros[np.lexsort((novos, c))]  # Os eventos saem por símbolo e, em cada símbolo, na ordem da matriz
+                for p, q, c in zip(p[ordem].tolist(), q[ordem].tolist(), simbolos[chegada_i[t[ordem]]].tolist()):
+                    rastro({'evento': 'par_marcado', 'p': estados[p], 'q': estados[q], 'simbolo': afdc.alfa[c], 'i': origem_i, 'j': origem_j})
+
+    while True:
+        if pilha:
+            # Junta os pedaços da pilha até PEDACO_PROPAGACAO pares, para não propagar muitos pedaços pequenos um a um
+            posicoes = [pilha.pop()]
+            quantidade = len(posicoes[0])
+            while pilha and quantidade + len(pilha[-1]) <= PEDACO_PROPAGACAO:
+                posicoes.append(pilha.pop())
+                quantidade += len(posicoes[-1])
+            posicoes = np.concatenate(posicoes)
+        elif cursor < total:
+            fim = min(cursor + PEDACO_PROPAGACAO, total)
+            posicoes = np.flatnonzero(np.unpackbits(bits[cursor >> 3:(fim + 7) >> 3], bitorder='little')[:fim - cursor]) + cursor
+            cursor = fim
+        else:
+            break
 
-    estadosUtilizados = {""} # Set de string que guardará todos os estados do AFD original que já foram utilizados nos estados compostos do AFD minimizado, para futura verificação de estados que continuarão isolados no AFD minimizado 
+        if not detalhado:
+            if len(posicoes):
+                propaga(posicoes)
+            continue
 
-    for i in afd['estados']: # Adiciona todos os pares de estados não marcados na matriz: os estados do AFD minimizado serão criados a partir deles
-        for j in afd['estados']:
-            if (i == j): # Ignora os elementos da diagonal principal para cima
-                break
-            
-            if (matriz[i][j] == 0): # Se o par de estados não estiver marcado na matriz, adiciona o array que contém os dois em 'estadosAfdMin', como também adiciona os dois estados em 'estadosUtilizados'
-                print(f'O par {i} e {j} foi marcado com 0')
-                estadosAfdMin.append([i, j])
-                estadosUtilizados.add(i)
-                estadosUtilizados.add(j)
+        for posicao in range(len(posicoes)):
+            i, j = pares_matriz(posicoes[posicao:posicao + 1])
+            if not (vivo[i[0]] and vivo[j[0]]):
+                continue
+            passo += 1
+            rastro({'evento': 'par_propagado', 'passo': passo, 'i': estados[i[0]], 'j': estados[j[0]]})
+            propaga(posicoes[posicao:posicao + 1])
+
+    if rastro:
+        rastro({'evento': 'propagacao', 'marcados': marcados})
+
+    if contar:
+        estatisticas.pares_examinados += examinados
+        estatisticas.pares_marcados += marcados
+        estatisticas.transicoes_seguidas += seguidas
+        estatisticas.fase('deriva_estados_matriz', inicio_fase)
+
+class ConjuntosDisjuntos:
+    # Union-find sobre os índices 0..n-1, com compressão de caminho e união por posto: cada conjunto é representado pela sua raiz
+
+    __slots__ = ('pai', 'posto')
+
+    def __init__(self, n):
+        self.pai = list(range(n))
+        self.posto = bytearray(n)
+
+    def encontra(self, q):
+        # Sobe até a raiz e depois faz todos os estados do caminho apontarem direto para ela
+        raiz = q
+        while self.pai[raiz] != raiz:
+            raiz = self.pai[raiz]
+        while self.pai[q] != raiz:
+            self.pai[q], q = raiz, self.pai[q]
+        return raiz
+
+    def une(self, p, q):
+        # Junta os conjuntos de p e q, pendurando a árvore de menor posto na de maior. Retorna False se já estavam juntos
+        p = self.encontra(p)
+        q = self.encontra(q)
+        if p == q:
+            return False
+        if self.posto[p] < self.posto[q]:
+            p, q = q, p
+        self.pai[q] = p
+        if self.posto[p] == self.posto[q]:
+            self.posto[p] += 1
+        return True
+
+def condensa_estados(afdc, matriz, rastro=None, estatisticas=None):
+
+    inicio = time.perf_counter() if estatisticas is not None else 0.0
+    estados = afdc.estados
+    detalhado = rastro is not None and rastro.detalhado
+
+    # Cada par de estados não marcado na matriz é equivalente, então os dois são unidos no mesmo conjunto. Como a equivalência é
+    # transitiva, os conjuntos formados ao final são exatamente os estados compostos do AFD minimizado
+    conjuntos = ConjuntosDisjuntos(len(estados))
+
+    for i in range(len(estados)):
+        for j in range(i): # Percorre só a diagonal inferior da matriz
+            if not matriz.marcado(i, j):
+                if detalhado:
+                    rastro({'evento': 'par_condensado', 'i': estados[i], 'j': estados[j]})
+                conjuntos.une(i, j)
+
+    # Agrupa os estados do AFD original pela raiz do seu conjunto. Cada grupo é um estado do AFD minimizado, exemplo: (C, D, E)
+    grupos = {}
+    for q in range(len(estados)):
+        grupos.setdefault(conjuntos.encontra(q), []).append(q)
+
+    if detalhado:
+        rastro({'evento': 'estados_isolados', 'estados': [estados[grupo[0]] for grupo in grupos.values() if len(grupo) == 1]})
+
+    # Numera os grupos e guarda, para cada estado do AFD original, o número do estado composto em que ele ficou
+    #
+    # O nome de cada estado composto é a lista ordenada dos estados originais que ele contém, montada uma única vez em uma string
+    estadosAfdMin = []
+    bloco_de = [0] * len(estados)
+    for b, grupo in enumerate(grupos.values()):
+        for q in grupo:
+            bloco_de[q] = b
+        estadosAfdMin.append(', '.join(sorted(estados[q] for q in grupo)))
+
+    # O estado composto que contém o estado inicial do AFD original é o estado inicial do AFD minimizado
+    estadoInicialAfdMin = estadosAfdMin[bloco_de[afdc.inicial]]
+    if detalhado:
+        rastro({'evento': 'estado_inicial', 'original': estados[afdc.inicial], 'composto': estadoInicialAfdMin})
+
+    # Os estados compostos que contêm estados finais do AFD original são finais no AFD minimizado (os estados de um grupo são todos finais ou todos não finais)
+    estadosFinaisAfdMin = []
+    for b, grupo in enumerate(grupos.values()):
+        if afdc.finais[grupo[0]]:
+            if detalhado:
+                rastro({'evento': 'estado_final', 'original': estados[grupo[0]], 'composto': estadosAfdMin[b]})
+            estadosFinaisAfdMin.append(estadosAfdMin[b])
+
+    if rastro:
+        rastro({'evento': 'condensacao', 'antes': len(estados), 'depois': len(estadosAfdMin)})
+
+    if estatisticas is not None: # Cada união bem-sucedida junta dois conjuntos, então são feitas n - (número de grupos) fusões
+        estatisticas.pares_examinados += len(estados) * (len(estados) - 1) // 2
+        estatisticas.fusoes += len(estados) - len(estadosAfdMin)
+        estatisticas.fase('condensa_estados', inicio)
+
+    return estadosAfdMin, estadoInicialAfdMin, estadosFinaisAfdMin, bloco_de
 
-    # Faz a junção de todos os estados do AFD minimizado que possuem alguma interseção de estados do AFD original
     
-    print('\nVamos olhar para as interseções nos estados agora:\n')
+def preenche_transicoes(afdc, estadosAfdMin, bloco_de, rastro=None, estatisticas=None):
+    # Monta as transições do AFD minimizado: 'bloco_de' diz, para cada estado do AFD original, a posição do seu estado composto em 'estadosAfdMin'
     
-    i = 0
-    while i < len(estadosAfdMin) - 1: # i vai até len(estadosAfdMin) - 1, pois j recebe i+1 sempre
-        j = i + 1
-        while j < len(estadosAfdMin):
-            if (set(estadosAfdMin[i]) & set(estadosAfdMin[j])): # Se houver interseção, os estados dos dois arrays de estados são mesclados no primeiro array e o segundo array é excluído
-                print(f'O par de estados {estadosAfdMin[i]} e {estadosAfdMin[j]} possui interseção, então eles serão mesclados.')
-                estadosAfdMin[i] = list(set(estadosAfdMin[i]).union(set(estadosAfdMin[j])))
-                estadosAfdMin.pop(j)
-            else:
-                j += 1
-        i += 1
+    inicio = time.perf_counter() if estatisticas is not None else 0.0
+    k = len(afdc.alfa)
+    detalhado = rastro is not None and rastro.detalhado
 
-    estadosUtilizados.remove("") # Apenas remove a string vazia que foi adicionada inicialmente para criar o set de string
+    # Um representante de cada estado composto (o primeiro estado original que caiu nele): como todos os estados do grupo são equivalentes, basta olhar para ele
+    representantes = [-1] * len(estadosAfdMin)
+    for q, b in enumerate(bloco_de):
+        if representantes[b] < 0:
+            representantes[b] = q
 
-    # Se algum estado não fizer parte de algum estado composto do AFD minimizado, então ele permanecerá isolado no AFD minimizado
-    estadosIsolados = set(afd['estados']) - estadosUtilizados
-    print(f'O(s) estado(s) isolado(s) é(são): {estadosIsolados}')
+    transicoesAfdMin = {}
 
-    # Adiciona os estados isolados aos estados do AFD minimizado
-    estadosAfdMin.append(list(estadosIsolados))
+    # Para cada estadoPartida no AFD minimizado
+    for b, estadoPartida in enumerate(estadosAfdMin):
+        transicoesAfdMin[estadoPartida] = {}
+        estado1 = representantes[b]
+        linha = afdc.linha(estado1)
 
-    estadoInicialAfdMin = [] # Armazena o estado inicial do AFD minimizado
-    estadosFinaisAfdMin = [] # Armazena os estados finais do AFD minimizado
+        # Para cada símbolo no alfabeto do AFD
+        for c, simbo in enumerate(afdc.alfa):
+            # O destino no AFD minimizado é o estado composto que contém o destino do representante no AFD original
+            destino1 = linha[c]
+            estado_destino = estadosAfdMin[bloco_de[destino1]]
 
-    for estado in estadosAfdMin:
+            # Preenche a transição
+            transicoesAfdMin[estadoPartida][simbo] = estado_destino
 
-        # Se o estado inicial do AFD original faz parte de um dos estados compostos do AFD minimizado, então esse estado composto será o estado inicial do AFD minimizado
-        if (afd['inicial'] in estado):
-            print(f'\nO estado inicial {afd["inicial"]} faz parte do estado composto {estado}')
-            print(f'então {estado} será estado inicial do AFD minimizado.')
-            estadoInicialAfdMin.append(estado)
+            if detalhado:
+                rastro({'evento': 'transicao', 'origem': estadoPartida, 'simbolo': simbo, 'destino': estado_destino,
+                        'representante': afdc.estados[estado1], 'destino_original': afdc.estados[destino1]})
 
-        # Se o estado final do AFD original faz parte de um dos estados compostos do AFD minimizado, então esse estado composto será um dos estados finais do AFD minimizado
-        if (set(estado) & set(afd['finais'])): # Testa se há interseção entre o estado composto atual com os estados finais do AFD original
-            print(f'\nO estado final {list(set(estado) & set(afd["finais"]))[0]} faz parte do estado composto {estado}, ')
-            print(f'então {estado} será final no AFD minimizado.')
-            estadosFinaisAfdMin.append(estado)
+    if estatisticas is not None:
+        estatisticas.transicoes_seguidas += len(estadosAfdMin) * k
+        estatisticas.estados_depois = len(estadosAfdMin)
+        estatisticas.fase('preenche_transicoes', inicio)
 
-    estadosAfdMin1 = [] # Array de strings que representarão cada um dos estados compostos do AFD minimizado. Esse tratamento é feito para acumular o nome do estado composto em apenas uma string
-    for estadoComposto in estadosAfdMin:
-        estadoComposto.sort() # Ordena os estados do AFD alfabeticamente
-        string = ""
-        for estado in estadoComposto:
-            string += str(estado) + ', '
-        estadosAfdMin1.append(string[:-2]) # Retira o que resta no final da string: ', ', e a adiciona ao array de strings
+    return transicoesAfdMin
 
-    estadoInicialAfdMin.sort() # Ordena o array de estado inicial alfabeticamente
 
-    estadoInicialAfdMin1 = "" # String que armazerá o nome do estado inicial do AFD minimizado. O motivo para o tratamento é o mesmo: condensar o nome do estado em apenas uma string
-    for estadoComposto in estadoInicialAfdMin:
-        for estado in estadoComposto:
-            estadoInicialAfdMin1 += estado + ', '
-    estadoInicialAfdMin1 = estadoInicialAfdMin1[:-2]
+def prepara_afd(afd, rastro=None, estatisticas=None):
+    # Passos comuns a todos os métodos antes da minimização: passa o AFD para a representação compacta e descarta os estados
+    # que não podem ser alcançados a partir do estado inicial (eles só aumentariam a matriz, e ficariam sobrando no AFD "mínimo")
+    inicio = time.perf_counter() if estatisticas is not None else 0.0
+    afdc = afd if isinstance(afd, AFDCompacto) else AFDCompacto.de_dict(afd)
+    afdc, removidos = remove_inalcancaveis(afdc)
 
-    estadosFinaisAfdMin.sort() # Ordena o array de estados finais alfabeticamente
+    if rastro:
+        rastro({'evento': 'inalcancaveis', 'removidos': removidos, 'restantes': len(afdc.estados)})
 
-    estadosFinaisAfdMin1 = [] # Array de strings que armazenará os estados finais compostos do AFD minimizado em strings
-    for estadoComposto in estadosFinaisAfdMin:
-        string = ''
-        for estado in estadoComposto:
-            string += estado + ', '
-        estadosFinaisAfdMin1.append(string[:-2])
+    # Se o AFD for parcial, as transições ausentes passam a ir para o estado de erro implícito
+    afdc, ausentes = completa_afd(afdc)
+    if rastro and ausentes:
+        rastro({'evento': 'estado_erro', 'estado': afdc.estados[-1], 'ausentes': ausentes})
 
-    return estadosAfdMin1, estadoInicialAfdMin1, estadosFinaisAfdMin1
+    if estatisticas is not None:
+        estatisticas.estados_antes = len(afdc.estados) + len(removidos) - (ausentes > 0)
+        estatisticas.estados_alcancaveis = len(afdc.estados) - (ausentes > 0)
+        estatisticas.fase('prepara_afd', inicio)
 
-    
-def preenche_transicoes(afd, estadosAfdMin):
-    
-    transicoesAfdMin = {}
+    return afdc
 
-    # Para cada estadoPartida no AFD minimizado
-    for estadoPartida in estadosAfdMin:
-        transicoesAfdMin[estadoPartida] = {}
+def prepara_simbolos(afdc, rastro=None, estatisticas=None):
+    # Devolve o AFD compacto sobre as classes de símbolos (veja agrupa_simbolos), usado pelos algoritmos no lugar do alfabeto completo.
+    # Os estados não mudam, então a partição encontrada vale para o AFD com todos os símbolos, que é o usado para montar as transições
+    inicio = time.perf_counter() if estatisticas is not None else 0.0
+    afdc_classes = agrupa_simbolos(afdc)
 
-        # Para cada símbolo no alfabeto do AFD
-        for simbo in afd['alfa']:
-            # Encontra o primeiro estado no conjunto de estados minimizados que corresponde à transição
-            for estado1 in estadoPartida.split(', '):  # Aqui garantimos que cada estado dentro do estadoPartida seja tratado corretamente como string
-                estado_destino = next(
-                    estado for estado in estadosAfdMin
-                    if afd['transicoes'][estado1][simbo] in estado.split(', ')
-                )
-                break
+    if rastro and afdc_classes is not afdc:
+        rastro({'evento': 'classes_simbolos', 'simbolos': len(afdc.alfa), 'classes': len(afdc_classes.alfa), 'nomes': afdc_classes.alfa})
 
-            # Preenche a transição
-            transicoesAfdMin[estadoPartida][simbo] = estado_destino
+    if estatisticas is not None:
+        estatisticas.classes_simbolos = len(afdc_classes.alfa)
+        estatisticas.fase('prepara_simbolos', inicio)
 
-            # Exibe a transição no terminal
-            print('-' * 50)
-            print(f"Preenchendo transição: {estadoPartida} --{simbo}--> {estado_destino}")
-            print(f"Explicação: O estado {estadoPartida} contém o estado {estado1} do AFD original.")
-            print(f"Para o símbolo '{simbo}', o estado {estado1} transita para {afd['transicoes'][estado1][simbo]} no AFD original.")
-            print(f"Portanto, no AFD minimizado, o estado {estadoPartida} transita para {estado_destino} com o símbolo '{simbo}'.\n")
+    return afdc_classes
 
-    return transicoesAfdMin
+def particao_myhill_nerode(afdc, afdc_classes, rastro=None, estatisticas=None):
+    # As três etapas do algoritmo sobre o AFD já preparado (veja prepara_afd e prepara_simbolos). Retorna a partição dos estados:
+    # os blocos (listas de índices) e, para cada estado, o número do seu bloco
+    detalhado = rastro is not None and rastro.detalhado
+
+    # Cria uma "matriz", onde seus indices serão os índices dos estados do AFD, com todos os pares desmarcados
+    matriz = MatrizTriangular(len(afdc.estados))
+
+    if rastro:
+        rastro({'evento': 'etapa', 'numero': 1})
+    if detalhado:
+        rastro({'evento': 'matriz', 'titulo': 'Matriz inicial: \n\n', 'matriz': bytes(matriz.bits), 'estados': afdc.estados, 'compacta': False,
+                'preenchidos': 0})
+
+    # Faz o setup inicial da matriz: marcando com 1 os pares de estados que contiverem somente um estado final, e marcando com 0 caso contrário
+    preenche_matriz_inicial(afdc, matriz, rastro, estatisticas)
+
+    if detalhado:
+        rastro({'evento': 'matriz', 'titulo': '\n\nMatriz após a primeira etapa:\n', 'matriz': bytes(matriz.bits), 'estados': afdc.estados, 'compacta': False})
+        rastro({'evento': 'matriz', 'titulo': '\nOu, de forma mais compacta:\n', 'matriz': bytes(matriz.bits), 'estados': afdc.estados, 'compacta': True})
+
+    # Aplica a regra do algoritmo na matriz
+    deriva_estados_matriz(afdc_classes, matriz, rastro, estatisticas)
+
+    if rastro:
+        rastro({'evento': 'etapa', 'numero': 3})
+    if detalhado:
+        rastro({'evento': 'matriz', 'titulo': '', 'matriz': bytes(matriz.bits), 'estados': afdc.estados, 'compacta': True})
+
+    _, _, _, bloco_de = condensa_estados(afdc, matriz, rastro, estatisticas)
 
+    blocos = [[] for _ in range(max(bloco_de) + 1)]
+    for q, b in enumerate(bloco_de):
+        blocos[b].append(q)
+    return blocos, bloco_de
 
-def myhill_nerode(afd):
+def myhill_nerode(afd, rastro=None, validar=True, estatisticas=None):
     # Implementação do algoritmo
     # 
     # Para cada par de estados com 0 na matriz (pares não marcados), verifica a transição de cada um dos estados do par para cada um dos símbolos do alfabeto. 
     #
     # O resultado é um outro par de estados. Se esse par resultante estiver marcado com 1 na matriz, o par inicial será também marcado na matriz, do contrário nada será feito
+    #
+    # O passo-a-passo é enviado para 'rastro' (veja a classe Rastro); com rastro=None o algoritmo roda em silêncio.
+    # Com validar=False, o AFD é tomado como já validado (por exemplo, pelo main)
+    #
+    # Os tempos e contadores de cada fase vão para 'estatisticas' (veja a classe Estatisticas); com estatisticas=None nada é medido
     
     # Valida o AFD
-    if validar_afd(afd):
-        print("AFD válido!")
+    if not validar or validar_afd(afd):
+        if rastro:
+            rastro({'evento': 'afd_valido'})
 
-        print('=' * 50)
-        print('\nPRIMEIRA ETAPA DO ALGORITMO DE MYHILL-NERODE\n')
-        print('=' * 50)
+        # Remove os estados inalcançáveis e completa o AFD parcial com o estado de erro
+        afdc = prepara_afd(afd, rastro, estatisticas)
+        afdc_classes = prepara_simbolos(afdc, rastro, estatisticas)  # A matriz é derivada sobre as classes de símbolos
+        blocos, bloco_de = particao_myhill_nerode(afdc, afdc_classes, rastro, estatisticas)
 
-        # Cria uma "matriz", onde seus indices serão os estados do AFD e a preenche completamente com -1
-        matriz = {estado: {estado_destino: -1 for estado_destino in afd['estados']} for estado in afd['estados']}
-
-        print("Matriz inicial: ")
-        print("\n")
-        mostra_matriz(matriz)
+        # Cria a estrutura do AFD minimizado: mesma do AFD original
+        return monta_afd_minimizado(afdc, blocos, bloco_de, rastro, estatisticas)
 
-        # Faz o setup inicial da matriz: marcando com 1 os pares de estados que contiverem somente um estado final, e marcando com 0 caso contrário
-        preenche_matriz_inicial(afd, matriz)
+    else:
+        print("AFD inválido. Corrija o arquivo e tente novamente.")
+        return {}
 
-        print('\n\nMatriz após a primeira etapa:\n')
-        mostra_matriz(matriz)
-        print("\nOu, de forma mais compacta:\n")
-        mostra_diagonal_inferior(matriz)
+"""
+=====================
 
-        # Aplica a regra do algoritmo na matriz
-        deriva_estados_matriz(afd, matriz)
-        print('=' * 50)
-        print('\nTERCEIRA ETAPA DO ALGORITMO MYHILL NERODE\n')
-        print('=' * 50)
-        print('Agora, vamos minimizar o AFD condensando alguns estados em um só.')
-        print('Basta verificar os pares de estados não marcados na matriz')
-        print('Se eles possuem estados em comum, eles serão condensados em um só.\n')
-        mostra_diagonal_inferior(matriz)
+ALGORITMO DE HOPCROFT
 
-        estadosAfdMin, estadoInicialAfdMin, estadosFinaisAfdMin = condensa_estados(afd, matriz)
+=====================
+"""
 
-        transicoesAfdMin = preenche_transicoes(afd, estadosAfdMin)
+def monta_afd_minimizado(afdc, blocos, bloco_de, rastro=None, estatisticas=None):
+    # Monta a estrutura do AFD minimizado (a mesma do AFD original) a partir de uma partição dos estados do AFD compacto
+    #
+    # 'blocos' é uma lista de listas de índices de estados e 'bloco_de' diz, para cada índice, em qual bloco ele está
+
+    # Ordena os blocos pela primeira aparição de seus estados no AFD original, para a saída não depender da ordem em que foram divididos
+    ordem = sorted(range(len(blocos)), key=lambda b: min(blocos[b]))
+    posicao = [0] * len(blocos)
+    for nova, b in enumerate(ordem):
+        posicao[b] = nova
+
+    # O nome de cada estado composto é a lista ordenada dos nomes dos estados originais que ele contém, exemplo: 'C, D, E'
+    estadosAfdMin = [', '.join(sorted(afdc.estados[q] for q in blocos[b])) for b in ordem]
+    bloco_de = [posicao[b] for b in bloco_de]
+
+    return {
+        'alfa': list(afdc.alfa),
+        'estados': estadosAfdMin,
+        'inicial': estadosAfdMin[bloco_de[afdc.inicial]],
+        'finais': [estadosAfdMin[posicao[b]] for b in ordem if afdc.finais[blocos[b][0]]],
+        'transicoes': preenche_transicoes(afdc, estadosAfdMin, bloco_de, rastro, estatisticas)
+    }
 
-        # Cria a estrutura do AFD minimizado: mesma do AFD original
-        afd_minimizado = {
-            'alfa': afd['alfa'],
-            'estados': [estado for estado in estadosAfdMin],
-            'inicial': (estadoInicialAfdMin),
-            'finais': [estado for estado in estadosFinaisAfdMin],
-            'transicoes': {estadoOrigem: {simbo: estadoDestino for simbo, estadoDestino in transicoes.items()} for estadoOrigem, transicoes in transicoesAfdMin.items()}
-        }
+def hopcroft(afd, rastro=None, validar=True, estatisticas=None):
+    # Minimização por refinamento de partições (algoritmo de Hopcroft), em O(k·n log n)
+    #
+    # Começa com a partição {finais, não finais} e vai dividindo os blocos: um bloco Y é dividido pelo par (A, símbolo) quando
+    # parte dos estados de Y vai para o bloco A lendo o símbolo e parte não vai. Só o menor pedaço de cada divisão entra na fila
+    # de divisores, e é isso que limita o custo total a n log n por símbolo
 
-        return afd_minimizado
+    # Valida o AFD (com validar=False, o AFD é tomado como já validado)
+    if validar and not validar_afd(afd):
+        print("AFD inválido. Corrija o arquivo e tente novamente.")
+        return {}
 
+    afdc = prepara_afd(afd, rastro, estatisticas)
+    afdc_classes = prepara_simbolos(afdc, rastro, estatisticas)
+    blocos, bloco_de = particao_hopcroft(afdc, afdc_classes, rastro, estatisticas)
+    return monta_afd_minimizado(afdc, blocos, bloco_de, rastro, estatisticas)
+
+def particao_hopcroft(afdc, afdc_classes, rastro=None, estatisticas=None):
+    # O refinamento sobre o AFD já preparado (veja prepara_afd e prepara_simbolos). Retorna os blocos (listas de índices) e o bloco de cada estado
+    inicio_fase = time.perf_counter() if estatisticas is not None else 0.0
+    n = len(afdc.estados)
+
+    # Transições inversas (sobre as classes de símbolos): as transições que chegam em q são as posições inicio[q]:inicio[q + 1] de
+    # 'simbolos' e 'origens'
+    inversas = afdc_classes.inversas()
+    inicio, simbolos, origens = inversas
+
+    # Os estados mortos (que não aceitam nenhuma palavra, inclusive o estado de erro implícito) são todos equivalentes entre si e diferentes
+    # dos vivos, então formam um bloco à parte, fora do refinamento. Entre os estados vivos, ir para um estado morto é o mesmo que não ter
+    # a transição, e por isso só as transições entre estados vivos são seguidas (o estado de erro não tem nenhuma transição guardada)
+    vivo = estados_vivos(afdc_classes, inversas)
+    mortos = [q for q in range(n) if not vivo[q]]
+
+    # Partição inicial dos estados vivos: estados finais e estados não finais (descartando o bloco vazio, se houver)
+    blocos = [bloco for bloco in (
+        {q for q in range(n) if afdc.finais[q]},
+        {q for q in range(n) if vivo[q] and not afdc.finais[q]}
+    ) if bloco]
+
+    bloco_de = [-1] * n
+    for b, bloco in enumerate(blocos):
+        for q in bloco:
+            bloco_de[q] = b
+
+    # Fila de divisores: com dois blocos iniciais, basta o menor deles. Com estados mortos, os dois entram: como as transições para os
+    # mortos não são seguidas, não ir para um bloco não é o mesmo que ir para o outro
+    if mortos:
+        fila = list(range(len(blocos)))
     else:
+        fila = [min(range(len(blocos)), key=lambda b: len(blocos[b]))] if len(blocos) == 2 else []
+    blocos_iniciais = len(blocos)
+
+    contar = estatisticas is not None
+    seguidas = 0
+    while fila:
+        # Agrupa, por símbolo e depois por bloco, os estados que vão para o divisor lendo o símbolo
+        por_simbolo = {}
+        for q in blocos[fila.pop()]:
+            for posicao in range(inicio[q], inicio[q + 1]):
+                por_simbolo.setdefault(simbolos[posicao], []).append(origens[posicao])
+
+        for c in sorted(por_simbolo):
+            atingidos = {}
+            for p in por_simbolo[c]:
+                atingidos.setdefault(bloco_de[p], []).append(p)
+            if contar:
+                seguidas += len(por_simbolo[c])
+
+            for y, parte in atingidos.items():
+                bloco = blocos[y]
+                if len(parte) == len(bloco): # O bloco inteiro vai para o divisor, então não há o que dividir
+                    continue
+
+                # O bloco y fica com o pedaço maior e o pedaço menor vira um bloco novo, custando O(|menor pedaço|)
+                if 2 * len(parte) <= len(bloco):
+                    menor = set(parte)
+                    bloco.difference_update(menor)
+                else:
+                    menor = bloco.difference(parte)
+                    blocos[y] = set(parte)
+
+                novo = len(blocos)
+                blocos.append(menor)
+                for q in menor:
+                    bloco_de[q] = novo
+
+                # Se y já estava na fila, os dois pedaços precisam estar nela; se não estava, basta o menor. Em ambos os casos, entra o novo
+                fila.append(novo)
+
+    if contar:
+        estatisticas.transicoes_seguidas += seguidas
+        estatisticas.divisoes += len(blocos) - blocos_iniciais
+        estatisticas.fase('hopcroft', inicio_fase)
+
+    # Os estados mortos entram como um único bloco
+    if mortos:
+        for q in mortos:
+            bloco_de[q] = len(blocos)
+        blocos.append(set(mortos))
+
+    if rastro:
+        rastro({'evento': 'minimizacao', 'metodo': 'hopcroft', 'antes': n, 'depois': len(blocos)})
+
+    return [list(bloco) for bloco in blocos], bloco_de
+
+"""
+=====================
+
+ALGORITMO DE MOORE
+
+=====================
+"""
+
+def moore(afd, rastro=None, validar=True, estatisticas=None):
+    # Minimização por refinamento de assinaturas (algoritmo de Moore), com todas as operações vetorizadas em NumPy
+    #
+    # Cada rodada calcula, para todos os estados de uma vez, a assinatura (bloco atual, bloco do destino de cada símbolo), usando a
+    # tabela n×k como índice, e renumera os blocos com np.unique sobre as linhas. Quando o número de blocos para de crescer, a
+    # partição é a do AFD mínimo. São no máximo n rodadas, mas em AFDs rasos costumam ser poucas
+
+    # Valida o AFD (com validar=False, o AFD é tomado como já validado)
+    if validar and not validar_afd(afd):
         print("AFD inválido. Corrija o arquivo e tente novamente.")
         return {}
 
+    afdc = prepara_afd(afd, rastro, estatisticas)
+    afdc_classes = prepara_simbolos(afdc, rastro, estatisticas)
+    blocos, bloco_de = particao_moore(afdc, afdc_classes, rastro, estatisticas)
+    return monta_afd_minimizado(afdc, blocos, bloco_de, rastro, estatisticas)
+
+def particao_moore(afdc, afdc_classes, rastro=None, estatisticas=None):
+    # As rodadas de refinamento sobre o AFD já preparado (veja prepara_afd e prepara_simbolos). Retorna os blocos (listas de índices)
+    # e o bloco de cada estado
+    inicio = time.perf_counter() if estatisticas is not None else 0.0
+    n = len(afdc.estados)
+
+    # Tabela de transições densa (uma coluna por classe de símbolos, com o estado de erro no lugar das ausentes) e os finais como arrays NumPy
+    tabela = afdc_classes.tabela()
+    _, bloco = np.unique(np.frombuffer(afdc.finais, dtype=np.uint8), return_inverse=True)  # Partição inicial: finais e não finais
+    quantidade = int(bloco.max()) + 1
+
+    rodadas = 0
+    while True:
+        rodadas += 1
+        assinaturas = np.column_stack((bloco, bloco[tabela]))
+        _, novo = np.unique(assinaturas, axis=0, return_inverse=True)
+        novo = novo.reshape(-1)
+        nova_quantidade = int(novo.max()) + 1
+        if nova_quantidade == quantidade:
+            break
+        bloco, quantidade = novo, nova_quantidade
+
+    if rastro:
+        rastro({'evento': 'minimizacao', 'metodo': 'moore', 'antes': n, 'depois': quantidade, 'rodadas': rodadas})
+
+    if estatisticas is not None: # Cada rodada lê a tabela inteira
+        estatisticas.rodadas += rodadas
+        estatisticas.transicoes_seguidas += rodadas * n * len(afdc_classes.alfa)
+        estatisticas.fase('moore', inicio)
+
+    # Separa os estados de cada bloco
+    bloco_de = bloco.tolist()
+    blocos = [[] for _ in range(quantidade)]
+    for q, b in enumerate(bloco_de):
+        blocos[b].append(q)
+
+    return blocos, bloco_de
+
+"""
+=====================
+
+CACHE DE RESULTADOS
+
+=====================
+"""
+
+import hashlib
+from collections import OrderedDict
+
+def forma_canonica(afdc):
+    # Renumera os estados de um AFD compacto (já sem inalcançáveis) pela ordem em que uma busca em largura a partir do estado inicial
+    # os encontra, seguindo os símbolos em ordem alfabética. Dois AFDs que só diferem nos nomes dos estados ou na ordem das linhas do
+    # arquivo chegam na mesma numeração, então o hash das transições renumeradas identifica o AFD pelo conteúdo
+    #
+    # Cada estado entra no hash com as transições que existem, como o número delas seguido dos pares (posição do símbolo em ordem
+    # alfabética, número canônico do destino). As ausentes vão para o estado de erro implícito, que fica por último na numeração
+    #
+    # Retorna o hash (hexadecimal) e 'ordem', onde ordem[i] é o índice no AFD compacto do estado de número canônico i
+    n = len(afdc.estados)
+    k = len(afdc.alfa)
+    colunas = sorted(range(k), key=lambda c: afdc.alfa[c])
+    posto = [0] * k  # Posição de cada símbolo na ordem alfabética
+    for r, c in enumerate(colunas):
+        posto[c] = r
+
+    novo = array('i', [-1]) * n
+    novo[afdc.inicial] = 0
+    ordem = [afdc.inicial]
+    tabela = array('i')
+    for q in ordem:  # A lista cresce durante o laço, funcionando como fila
+        transicoes = sorted((posto[c], destino) for c, destino in afdc.transicoes_de(q))
+        tabela.append(len(transicoes))
+        for r, destino in transicoes:
+            if novo[destino] < 0:
+                novo[destino] = len(ordem)
+                ordem.append(destino)
+            tabela.append(r)
+            tabela.append(novo[destino])
+    if afdc.erro >= 0:
+        ordem.append(afdc.erro)
+
+    if sys.byteorder == 'big':
+        tabela.byteswap()
+
+    resumo = hashlib.sha256()
+    resumo.update(struct.pack('<III', len(ordem), k, afdc.erro >= 0))
+    resumo.update('\n'.join(afdc.alfa[c] for c in colunas).encode('utf-8') + b'\0')
+    resumo.update(bytes(afdc.finais[q] for q in ordem))
+    resumo.update(tabela)
+    return resumo.hexdigest(), ordem
+
+class CacheMinimizacao:
+    # Guarda a partição dos estados do AFD mínimo, indexada pelo hash de forma_canonica: particao[i] é o bloco do estado de número canônico i
+    #
+    # Os resultados ficam num LRU em memória com no máximo 'capacidade' AFDs e, se 'diretorio' for dado, também em '<diretorio>/<hash>.part'
+    # (inteiros de 32 bits little-endian), para serem reaproveitados por outras execuções e pelos outros processos do lote
+
+    __slots__ = ('capacidade', 'diretorio', 'memoria', 'acertos', 'faltas')
+
+    def __init__(self, capacidade=256, diretorio=None):
+        self.capacidade = capacidade
+        self.diretorio = diretorio
+        self.memoria = OrderedDict()  # Hash -> partição, do usado há mais tempo para o mais recente
+        self.acertos = 0
+        self.faltas = 0
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def obtem(self, chave, estados):
+        # Partição guardada para o AFD de hash 'chave', que tem 'estados' estados (None se não houver). Uma partição lida do disco só é
+        # aceita se tiver um bloco para cada estado, numerados a partir de 0 pela ordem canônica: um arquivo truncado, corrompido ou
+        # editado à mão conta como falta, e o AFD é minimizado de novo
+        particao = self.memoria.get(chave)
+        if particao is not None:
+            self.memoria.move_to_end(chave)
+        elif self.diretorio:
+            try:
+                with open(os.path.join(self.diretorio, chave + '.part'), 'rb') as f:
+                    particao = array('i', f.read())
+            except (OSError, ValueError):
+                particao = None
+            if particao is not None:
+                if sys.byteorder == 'big':
+                    particao.byteswap()
+                if particao_valida(particao, estados):
+                    self.guarda(chave, particao, gravar=False)
+                else:
+                    particao = None
+
+        if particao is None:
+            self.faltas += 1
+        else:
+            self.acertos += 1
+        return particao
+
+    def guarda(self, chave, particao, gravar=True):
+        self.memoria[chave] = particao
+        self.memoria.move_to_end(chave)
+        while len(self.memoria) > self.capacidade:
+            self.memoria.popitem(last=False)
+
+        if gravar and self.diretorio:
+            dados = array('i', particao)
+            if sys.byteorder == 'big':
+                dados.byteswap()
+            # Grava num arquivo temporário e renomeia, para outro processo nunca ler uma partição pela metade
+            caminho = os.path.join(self.diretorio, chave + '.part')
+            temporario = f'{caminho}.{os.getpid()}.tmp'
+            with open(temporario, 'wb') as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+
+def particao_valida(particao, estados):
+    # Confere uma partição do cache: 'estados' blocos não negativos, cada um numerado no máximo uma unidade acima do maior número anterior
+    if len(particao) != estados or (estados and min(particao) < 0):
+        return False
+    maior = -1
+    for b in particao:
+        if b > maior + 1:
+            return False
+        maior = max(maior, b)
+    return True
+
+# Partição calculada por cada método sobre o AFD já preparado: no cache, o AFD é preparado uma única vez, serve para o hash e para
+# o método, e a partição encontrada é a guardada
+PARTICOES = {
+    myhill_nerode: particao_myhill_nerode,
+    hopcroft: particao_hopcroft,
+    moore: particao_moore
+}
+
+def minimiza_com_cache(afd, cache, metodo=myhill_nerode, rastro=None, validar=True, estatisticas=None):
+    # Minimiza o AFD com 'metodo', reaproveitando o resultado de um AFD igual (a menos dos nomes dos estados) que já esteja no cache
+    #
+    # Todos os métodos chegam ao mesmo AFD mínimo, então o método não faz parte da chave. No acerto, a partição guardada é traduzida
+    # de volta para os estados deste AFD e o AFD minimizado é montado sem rodar o algoritmo
+
+    # Valida o AFD (com validar=False, o AFD é tomado como já validado)
+    if validar and not validar_afd(afd):
+        print("AFD inválido. Corrija o arquivo e tente novamente.")
+        return {}
+
+    afdc = prepara_afd(afd, rastro, estatisticas)
+    inicio = time.perf_counter() if estatisticas is not None else 0.0
+    chave, ordem = forma_canonica(afdc)
+
+    particao = cache.obtem(chave, len(ordem))
+    if particao is not None:
+        bloco_de = [0] * len(ordem)
+        blocos = [[] for _ in range(max(particao) + 1)]
+        for i, q in enumerate(ordem):
+            bloco_de[q] = particao[i]
+            blocos[particao[i]].append(q)
+
+        if rastro:
+            quantidade = len(afd.estados) if isinstance(afd, AFDCompacto) else len(afd['estados'])
+            rastro({'evento': 'cache', 'chave': chave, 'estados': quantidade, 'blocos': len(blocos)})
+        if estatisticas is not None:
+            estatisticas.fase('cache', inicio)
+
+        return monta_afd_minimizado(afdc, blocos, bloco_de, rastro, estatisticas)
+
+    afdc_classes = prepara_simbolos(afdc, rastro, estatisticas)
+    blocos, bloco_de = PARTICOES[metodo](afdc, afdc_classes, rastro, estatisticas)
+
+    # Guarda a partição com os blocos numerados pela ordem canônica, para que não dependa da ordem dos estados neste AFD
+    numero = {}
+    cache.guarda(chave, array('i', (numero.setdefault(bloco_de[q], len(numero)) for q in ordem)))
+
+    return monta_afd_minimizado(afdc, blocos, bloco_de, rastro, estatisticas)
+
+"""
+=====================
+
+EQUIVALÊNCIA DE AFDs
+
+=====================
+"""
+
+def equivalentes(afd1, afd2, validar=True):
+    # Verifica se os dois AFDs aceitam a mesma linguagem sem minimizar nenhum deles (algoritmo de Hopcroft e Karp), em tempo quase linear
+    #
+    # Parte do par de estados iniciais e anda pelos pares (p, q) de estados dos dois AFDs alcançados pela mesma palavra, unindo p e q
+    # num union-find. Um par cujos estados já estão no mesmo conjunto não precisa ser visitado de novo (a equivalência é transitiva),
+    # então são no máximo n1 + n2 uniões. Se algum par tiver um estado final e um não final, a palavra que leva até ele é aceita por
+    # um AFD e rejeitada pelo outro. Como os pares são visitados em largura, essa é uma das palavras mais curtas que distinguem os dois
+    #
+    # O alfabeto é a união dos dois alfabetos: um símbolo ausente num AFD (ou uma transição ausente) leva a um estado de erro não final
+    #
+    # Retorna (True, None) se os AFDs forem equivalentes e (False, palavra) se não forem, com a palavra como lista de símbolos
+    # ([] quando só um dos estados iniciais é final). Com validar=False, os AFDs são tomados como já validados
+    if validar and not (validar_afd(afd1) and validar_afd(afd2)):
+        print("AFD inválido. Corrija o arquivo e tente novamente.")
+        return False, None
+
+    afds = [afd if isinstance(afd, AFDCompacto) else AFDCompacto.de_dict(afd) for afd in (afd1, afd2)]
+    alfa = list(dict.fromkeys(list(afds[0].alfa) + list(afds[1].alfa)))
+
+    # Numeração única dos estados dos dois AFDs: os do primeiro, o estado de erro do primeiro, os do segundo e o estado de erro do segundo
+    bases = (0, len(afds[0].estados) + 1)
+    finais = afds[0].finais + b'\0' + afds[1].finais + b'\0'
+    colunas = [[afdc.indice_simbolo.get(simbo, -1) for simbo in alfa] for afdc in afds]  # Posição de cada símbolo de 'alfa' em cada AFD
+
+    def proximo(a, q, c):
+        # Destino do estado q (na numeração única) do AFD a lendo o símbolo alfa[c]
+        afdc = afds[a]
+        erro = bases[a] + len(afdc.estados)
+        coluna = colunas[a][c]
+        if q == erro or coluna < 0:
+            return erro
+        destino = afdc.destino(q - bases[a], coluna)
+        return bases[a] + destino if destino >= 0 else erro
+
+    conjuntos = ConjuntosDisjuntos(len(finais))
+    inicial1, inicial2 = afds[0].inicial, bases[1] + afds[1].inicial
+    if finais[inicial1] != finais[inicial2]:
+        return False, []
+    conjuntos.une(inicial1, inicial2)
+
+    # Cada par visitado guarda o par de onde veio e o símbolo lido, para remontar a palavra que leva até ele
+    pares = [(inicial1, inicial2)]
+    anterior = [-1]
+    simbolo = [-1]
+    for i, (p, q) in enumerate(pares):  # A lista cresce durante o laço, funcionando como fila
+        for c in range(len(alfa)):
+            p2 = proximo(0, p, c)
+            q2 = proximo(1, q, c)
+            if not conjuntos.une(p2, q2):
+                continue
+
+            pares.append((p2, q2))
+            anterior.append(i)
+            simbolo.append(c)
+            if finais[p2] != finais[q2]:
+                palavra = []
+                j = len(pares) - 1
+                while j > 0:
+                    palavra.append(alfa[simbolo[j]])
+                    j = anterior[j]
+                return False, palavra[::-1]
+
+    return True, None
+
+def formata_palavra(palavra):
+    # Texto de uma palavra (lista de símbolos): os símbolos colados se todos tiverem um caractere, separados por espaço se não; 'ε' se vazia
+    if not palavra:
+        return 'ε'
+    return ''.join(palavra) if all(len(simbo) == 1 for simbo in palavra) else ' '.join(palavra)
+
+def compara_arquivos(arquivo1, arquivo2, cache=False):
+    # Lê e valida os dois AFDs, mostrando os problemas de cada um, e diz se são equivalentes. Retorna o mesmo par de 'equivalentes'
+    afds = []
+    for arquivo in (arquivo1, arquivo2):
+        problemas = []
+        afd = carrega_afd(arquivo, cache, problemas)
+        if afd is None or not validar_afd(afd, problemas):
+            print(f"AFD inválido em '{arquivo}'. Corrija o arquivo e tente novamente.")
+            return False, None
+        afds.append(afd)
+
+    iguais, palavra = equivalentes(afds[0], afds[1], validar=False)
+    if iguais:
+        print(f"Os AFDs de '{arquivo1}' e '{arquivo2}' são equivalentes: aceitam a mesma linguagem.")
+    else:
+        print(f"Os AFDs de '{arquivo1}' e '{arquivo2}' não são equivalentes: a palavra '{formata_palavra(palavra)}' é aceita por um e rejeitada pelo outro.")
+    return iguais, palavra
+
+"""
+=====================
+
+RECONHECIMENTO DE PALAVRAS
+
+=====================
+"""
+
+from itertools import islice
+
+# Número máximo de palavras avançadas juntas pela tabela (veja Reconhecedor.estados_finais_lote)
+PEDACO_RECONHECIMENTO = 65536
+
+class Reconhecedor:
+    # Compila um AFD (normalmente o minimizado) numa tabela densa de inteiros em NumPy, para decidir rapidamente se muitas palavras são aceitas
+    #
+    # A tabela tem uma linha por estado e uma coluna por símbolo, mais uma linha para o estado de erro e uma coluna para os símbolos que
+    # não estão no alfabeto: as transições ausentes e os símbolos desconhecidos levam ao estado de erro, que não é final e não sai de si mesmo.
+    # O estado de erro tem índice len(estados), e os demais estados têm os índices de afd['estados']
+    #
+    # Se todos os símbolos tiverem um caractere, uma palavra é uma string; se não, é uma sequência de símbolos (lista, tupla...)
+    # Palavras de mesmo tamanho são processadas juntas: a cada posição, um único acesso vetorizado à tabela avança todas elas
+
+    __slots__ = ('estados', 'alfa', 'coluna', 'inicial', 'largura', 'linhas', 'tabela', 'finais', 'por_caractere')
+
+    def __init__(self, afd):
+        afdc = afd if isinstance(afd, AFDCompacto) else AFDCompacto.de_dict(afd)
+        n = len(afdc.estados)
+        k = len(afdc.alfa)
+
+        self.estados = list(afdc.estados)
+        self.alfa = list(afdc.alfa)
+        self.coluna = dict(afdc.indice_simbolo)  # Símbolo -> coluna da tabela (k para os símbolos desconhecidos)
+        self.inicial = afdc.inicial
+        self.largura = k + 1
+
+        tabela = np.full((n + 1, k + 1), n, dtype=np.int64)
+        transicoes = afdc.tabela()
+        tabela[:n, :k] = np.where(transicoes >= 0, transicoes, n)
+        self.tabela = tabela.reshape(-1)  # Tabela plana: o destino do estado q lendo a coluna c está em q * largura + c
+        self.linhas = tabela.tolist()     # A mesma tabela em listas, mais rápida para andar por uma palavra só
+        self.finais = np.append(np.frombuffer(afdc.finais, dtype=np.uint8).astype(bool), False)
+
+        # Com símbolos de um caractere, converte uma string inteira de uma vez: a coluna de cada caractere é buscada pelo seu código Unicode
+        self.por_caractere = None
+        if all(len(simbo) == 1 for simbo in self.alfa):
+            self.por_caractere = np.full(max(map(ord, self.alfa), default=0) + 2, k, dtype=np.int64)  # A última posição vale para os códigos maiores
+            for simbo, c in self.coluna.items():
+                self.por_caractere[ord(simbo)] = c
+
+    def estado_final(self, palavra):
+        # Índice do estado em que a palavra termina (len(estados) se ela cair no estado de erro)
+        q = self.inicial
+        linhas = self.linhas
+        desconhecido = self.largura - 1
+        for simbo in palavra:
+            q = linhas[q][self.coluna.get(simbo, desconhecido)]
+        return q
+
+    def aceita(self, palavra):
+        return bool(self.finais[self.estado_final(palavra)])
+
+    def colunas_lote(self, palavras, tamanho):
+        # Matriz tamanho × len(palavras) com as colunas dos símbolos das palavras (todas com o mesmo tamanho): a linha j tem o j-ésimo símbolo de cada uma
+        if self.por_caractere is not None and all(isinstance(palavra, str) for palavra in palavras):
+            codigos = np.frombuffer(''.join(palavras).encode('utf-32-le'), dtype=np.uint32).reshape(len(palavras), tamanho)
+            colunas = self.por_caractere[np.minimum(codigos, len(self.por_caractere) - 1)]
+        else:
+            desconhecido = self.largura - 1
+            colunas = np.fromiter((self.coluna.get(simbo, desconhecido) for palavra in palavras for simbo in palavra),
+                                  dtype=np.int64, count=len(palavras) * tamanho).reshape(len(palavras), tamanho)
+        return np.ascontiguousarray(colunas.T)
+
+    def estados_finais_lote(self, palavras):
+        # Array com o índice do estado em que termina cada palavra, na ordem recebida
+        palavras = list(palavras)
+        por_tamanho = {}
+        for i, palavra in enumerate(palavras):
+            por_tamanho.setdefault(len(palavra), []).append(i)
+
+        # Os grupos grandes são processados em pedaços de até PEDACO_RECONHECIMENTO palavras, para os arrays intermediários caberem no cache
+        resultado = np.full(len(palavras), self.inicial, dtype=np.int64)
+        for tamanho, indices in por_tamanho.items():
+            if tamanho == 0:
+                continue
+            for inicio in range(0, len(indices), PEDACO_RECONHECIMENTO):
+                pedaco = indices[inicio:inicio + PEDACO_RECONHECIMENTO]
+                colunas = self.colunas_lote([palavras[i] for i in pedaco], tamanho)
+                q = np.full(len(pedaco), self.inicial, dtype=np.int64)
+                for linha in colunas:  # Avança todas as palavras do pedaço um símbolo por vez
+                    q = self.tabela[q * self.largura + linha]
+                resultado[pedaco] = q
+        return resultado
+
+    def aceita_lote(self, palavras):
+        # Array de booleanos: True para cada palavra aceita, na ordem recebida
+        return self.finais[self.estados_finais_lote(palavras)]
+
+    def aceita_fluxo(self, palavras, tamanho_lote=PEDACO_RECONHECIMENTO, estados=False):
+        # Gerador para entradas grandes (por exemplo, as linhas de um arquivo): lê as palavras em lotes de 'tamanho_lote' e devolve, para cada palavra,
+        # o par (palavra, aceita) ou, com estados=True, o par (palavra, índice do estado final), sem carregar a entrada inteira na memória
+        palavras = iter(palavras)
+        while True:
+            lote = list(islice(palavras, tamanho_lote))
+            if not lote:
+                return
+            finais = self.estados_finais_lote(lote)
+            yield from zip(lote, (finais if estados else self.finais[finais]).tolist())
+
+def le_palavras(arquivo, reconhecedor):
+    # Lê as palavras de um arquivo, uma por linha (a linha vazia é a palavra vazia). Com símbolos de mais de um caractere, os símbolos da palavra
+    # vêm separados por espaços
+    with open(arquivo, 'r') as f:
+        for linha in f:
+            linha = linha.rstrip('\n')
+            yield linha if reconhecedor.por_caractere is not None else tuple(linha.split())
+
+def reconhece_arquivo(afd, arquivo):
+    # Diz quais palavras do arquivo são aceitas pelo AFD, uma por linha, e retorna quantas foram aceitas e quantas foram rejeitadas
+    reconhecedor = Reconhecedor(afd)
+    aceitas = rejeitadas = 0
+    for palavra, aceita in reconhecedor.aceita_fluxo(le_palavras(arquivo, reconhecedor)):
+        texto = formata_palavra(list(palavra))
+        if aceita:
+            aceitas += 1
+            print(f"'{texto}': aceita")
+        else:
+            rejeitadas += 1
+            print(f"'{texto}': rejeitada")
+    print(f'{aceitas + rejeitadas} palavra(s): {aceitas} aceita(s) e {rejeitadas} rejeitada(s).')
+    return aceitas, rejeitadas
+
+"""
+=====================
+
+MINIMIZAÇÃO EM LOTE
+
+=====================
+"""
+
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
+
+def lista_arquivos_lote(entradas):
+    # Expande as entradas do lote: um diretório vira todos os seus arquivos .txt e .afdb, e um padrão (ex.: 'afds/*.txt') vira os arquivos que casam com ele
+    #
+    # Um '<arquivo>.afdb' cujo '<arquivo>' também está no lote é o binário gravado pela opção --cache (veja carrega_afd), e não outro AFD: fica de fora
+    arquivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            arquivos.extend(sorted(os.path.join(entrada, nome) for nome in os.listdir(entrada) if nome.endswith(('.txt', '.afdb'))))
+        else:
+            arquivos.extend(sorted(glob.glob(entrada)))
+    arquivos = list(dict.fromkeys(arquivos))  # Remove repetidos, mantendo a ordem
+
+    fontes = set(arquivos)
+    return [arquivo for arquivo in arquivos if not (arquivo.endswith('.afdb') and arquivo[:-len('.afdb')] in fontes)]
+
+def nomes_saida_lote(arquivos):
+    # Nome do .json de cada arquivo do lote: o caminho relativo ao diretório comum a todos os arquivos, trocando a extensão por '.json'
+    # (ex.: 'd1/x.txt' e 'd2/x.txt' viram 'd1/x.json' e 'd2/x.json'). Se dois arquivos só diferirem na extensão, como 'x.txt' e 'x.afdb',
+    # os dois mantêm a extensão ('x.txt.json' e 'x.afdb.json'), então um resultado nunca sobrescreve o outro
+    caminhos = [os.path.abspath(arquivo) for arquivo in arquivos]
+    raiz = os.path.commonpath([os.path.dirname(caminho) for caminho in caminhos])
+    relativos = [os.path.relpath(caminho, raiz) for caminho in caminhos]
+
+    sem_extensao = [os.path.splitext(relativo)[0] for relativo in relativos]
+    repeticoes = {}
+    for nome in sem_extensao:
+        repeticoes[nome] = repeticoes.get(nome, 0) + 1
+    return [(nome if repeticoes[nome] == 1 else relativo) + '.json' for nome, relativo in zip(sem_extensao, relativos)]
+
+# Um cache de resultados por diretório em cada processo do lote (veja minimiza_arquivo)
+CACHES_RESULTADOS = {}
+
+def minimiza_arquivo(arquivo, metodo, saida=None, cache=False, cache_resultados=None):
+    # Minimiza um arquivo do lote, sem passo-a-passo e sem diagramas. Roda dentro dos processos do lote, então devolve só um resumo
+    # (com as estatísticas da minimização, veja a classe Estatisticas):
+    #
+    # Com 'saida' (o caminho de um .json, veja nomes_saida_lote), grava nele o AFD minimizado, no mesmo formato impresso pelo main; sem 'saida',
+    # devolve o AFD minimizado já convertido em uma linha JSON (formato JSON Lines)
+    #
+    # Com 'cache_resultados' (um diretório, ou '' para só memória), os AFDs iguais a um já minimizado, neste processo ou em uma execução
+    # anterior que usou o mesmo diretório, não passam pelo algoritmo (veja minimiza_com_cache)
+    inicio = time.perf_counter()
+    resultado = {'arquivo': arquivo}
+
+    try:
+        problemas = []
+        afd = carrega_afd(arquivo, cache, problemas)
+        if afd is None:
+            resultado['erros'] = ['Erro ao carregar o AFD.']
+            return resultado
+
+        problemas += relatorio_afd(afd)
+        if problemas:
+            resultado['erros'] = [descreve_problema(problema) for problema in problemas]
+            return resultado
+
+        estatisticas = Estatisticas()
+        if cache_resultados is None:
+            afd_minimizado = METODOS[metodo](afd, None, validar=False, estatisticas=estatisticas)
+        else:
+            if cache_resultados not in CACHES_RESULTADOS:
+                CACHES_RESULTADOS[cache_resultados] = CacheMinimizacao(diretorio=cache_resultados or None)
+            afd_minimizado = minimiza_com_cache(afd, CACHES_RESULTADOS[cache_resultados], METODOS[metodo], validar=False, estatisticas=estatisticas)
+
+        if saida is not None:
+            os.makedirs(os.path.dirname(saida), exist_ok=True)
+            with open(saida, 'w') as f:
+                json.dump(afd_minimizado, f, indent=4)
+        else:
+            resultado['linha'] = json.dumps({'arquivo': arquivo, 'afd_minimizado': afd_minimizado})
+    except (OSError, ValueError) as erro:
+        resultado['erros'] = [f'Erro: {erro}']
+        return resultado
+    except Exception as erro:
+        # Qualquer outra falha também fica só neste arquivo: se a exceção escapasse, executor.map a levantaria de novo no processo principal
+        # e o lote inteiro pararia, sem o resumo dos outros arquivos
+        resultado['erros'] = [f'Erro inesperado ({type(erro).__name__}): {erro}']
+        return resultado
+
+    resultado['estados'] = len(afd.estados)
+    resultado['estados_minimizado'] = len(afd_minimizado['estados'])
+    resultado['estatisticas'] = estatisticas.para_dict()
+
+    resultado['segundos'] = time.perf_counter() - inicio
+    return resultado
+
+def minimiza_lote(entradas, saida, metodo='hopcroft', trabalhadores=None, formato='json', cache=False, cache_resultados=None):
+    # Minimiza vários AFDs em paralelo, um por processo de um ProcessPoolExecutor (por padrão, um processo por núcleo)
+    #
+    # formato 'json': um arquivo .json por AFD, dentro do diretório 'saida' (com os nomes de nomes_saida_lote)
+    # formato 'jsonl': um único arquivo 'saida', com uma linha JSON por AFD (na ordem das entradas)
+    arquivos = lista_arquivos_lote(entradas)
+    if not arquivos:
+        print("Nenhum arquivo encontrado para o lote.")
+        return []
+
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    if formato == 'json':
+        saidas = [os.path.join(saida, nome) for nome in nomes_saida_lote(arquivos)]
+    else:
+        saidas = repeat(None)
+
+    inicio = time.perf_counter()
+    resultados = []
+
+    # Manda os arquivos em pedaços para cada processo, para não pagar a comunicação entre processos a cada AFD pequeno
+    pedaco = max(1, len(arquivos) // (trabalhadores * 4))
+    with ProcessPoolExecutor(max_workers=trabalhadores) as executor, (open(saida, 'w') if formato == 'jsonl' else nullcontext()) as linhas:
+        for resultado in executor.map(minimiza_arquivo, arquivos, repeat(metodo), saidas, repeat(cache),
+                                      repeat(cache_resultados), chunksize=pedaco):
+            if 'linha' in resultado:
+                linhas.write(resultado.pop('linha') + '\n')
+            resultados.append(resultado)
+
+    mostra_resumo_lote(resultados, time.perf_counter() - inicio, trabalhadores)
+    return resultados
+
+def mostra_resumo_lote(resultados, segundos, trabalhadores):
+    minimizados = [resultado for resultado in resultados if 'erros' not in resultado]
+    com_erro = [resultado for resultado in resultados if 'erros' in resultado]
+
+    print(f'Lote: {len(resultados)} arquivo(s) em {segundos:.2f} s com {trabalhadores} processo(s) ({len(resultados) / segundos:.1f} arquivos/s)')
+    print(f'Minimizados: {len(minimizados)} | com erro: {len(com_erro)}')
+    if minimizados:
+        antes = sum(resultado['estados'] for resultado in minimizados)
+        depois = sum(resultado['estados_minimizado'] for resultado in minimizados)
+        print(f'Estados: {antes} -> {depois}')
+        reaproveitados = sum('cache' in resultado['estatisticas']['tempos'] for resultado in minimizados)
+        if reaproveitados:
+            print(f'Reaproveitados do cache de resultados: {reaproveitados}')
+    for resultado in com_erro:
+        print(f"{resultado['arquivo']}: {resultado['erros'][0]}" + (f" (e mais {len(resultado['erros']) - 1})" if len(resultado['erros']) > 1 else ''))
+
 #################################################################################################
 
+import argparse
 import json
 
+# Métodos de minimização disponíveis na linha de comando
+METODOS = {
+    'myhill_nerode': myhill_nerode,  # Table Filling Method, mostrando o passo-a-passo
+    'hopcroft': hopcroft,            # Refinamento de partições, para AFDs grandes
+    'moore': moore                   # Refinamento de assinaturas vetorizado em NumPy, para alfabetos largos e AFDs rasos
+}
+
 def main():
-    afd = ler_afd('afd.txt')  # Lê o AFD de um arquivo
+    parser = argparse.ArgumentParser(description='Minimizador de Autômatos Finitos Determinísticos')
+    parser.add_argument('arquivo', nargs='?', default='afd.txt', help='arquivo .txt (ou .afdb) com a descrição do AFD (padrão: afd.txt)')
+    parser.add_argument('-m', '--metodo', choices=METODOS, help='algoritmo de minimização (padrão: myhill_nerode, ou hopcroft no lote)')
+    parser.add_argument('-r', '--rastro', choices=NIVEIS_RASTRO, default='passo', help='detalhe da explicação: silencioso, resumo ou passo-a-passo (padrão: passo)')
+    parser.add_argument('--cache', action='store_true', help='guarda o AFD lido em <arquivo>.afdb e reaproveita esse binário nas próximas execuções')
+    parser.add_argument('--estatisticas', action='store_true', help='mostra os tempos e contadores de cada fase da minimização')
+    parser.add_argument('--cache-resultados', nargs='?', const='', metavar='DIRETORIO',
+                        help='reaproveita a minimização de AFDs iguais (a menos dos nomes dos estados) já minimizados; com um diretório, guarda os resultados nele entre execuções')
+    parser.add_argument('-d', '--diagrama', choices=MODOS_DIAGRAMA, default='fundo',
+                        help='janela (espera o desenho), fundo (desenha sem atrasar a minimização), dot (só grava o .gv) ou nenhum (padrão: fundo)')
+    parser.add_argument('--limite-diagrama', type=int, default=LIMITE_DIAGRAMA,
+                        help=f'acima desse número de estados, mostra um resumo no lugar do desenho (padrão: {LIMITE_DIAGRAMA})')
+    parser.add_argument('--reconhece', metavar='PALAVRAS', help='depois de minimizar, diz quais palavras do arquivo PALAVRAS (uma por linha) são aceitas pelo AFD minimizado')
+    parser.add_argument('--compara', metavar='OUTRO_ARQUIVO', help='em vez de minimizar, verifica se o AFD é equivalente ao de OUTRO_ARQUIVO e mostra uma palavra que os distingue')
+
+    lote = parser.add_argument_group('minimização em lote', 'minimiza vários AFDs em paralelo, sem passo-a-passo e sem diagramas')
+    lote.add_argument('--lote', action='append', metavar='ENTRADA', help='diretório ou padrão de arquivos (ex.: "afds/*.txt"); pode ser repetido')
+    lote.add_argument('-o', '--saida', help='diretório dos .json (formato json) ou arquivo de saída (formato jsonl)')
+    lote.add_argument('-j', '--trabalhadores', type=int, help='número de processos (padrão: número de núcleos)')
+    lote.add_argument('--formato', choices=('json', 'jsonl'), default='json', help='um .json por AFD ou um único arquivo JSON Lines (padrão: json)')
+    args = parser.parse_args()
+
+    if args.lote:
+        saida = args.saida or ('minimizados' if args.formato == 'json' else 'minimizados.jsonl')
+        minimiza_lote(args.lote, saida, args.metodo or 'hopcroft', args.trabalhadores, args.formato, args.cache, args.cache_resultados)
+        return
+
+    if args.compara:
+        compara_arquivos(args.arquivo, args.compara, args.cache)
+        return
+
+    problemas = []  # Problemas encontrados na leitura, reportados junto com os da validação
+    afd = carrega_afd(args.arquivo, args.cache, problemas)  # Lê o AFD de um arquivo, direto para a representação compacta
 
     if afd is None:
         print("Erro ao carregar o AFD. Verifique o arquivo de entrada.")
         return
 
-    if validar_afd(afd):
-        exibir_diagrama_afd(afd, "afd_inicial")  # Exibe o AFD inicial
-        afd_minimizado = myhill_nerode(afd)  # Recebe a estrutura do afd minimizado pelo algoritmo
-        exibir_diagrama_afd(afd_minimizado, "afd_minimizado")  # Exibe o AFD minimizado
+    # Valida o AFD uma única vez, mostrando todos os problemas encontrados
+    if validar_afd(afd, problemas):
+        exibir_diagrama_afd(afd, "afd_inicial", args.diagrama, args.limite_diagrama)  # Exibe o AFD inicial
+        estatisticas = Estatisticas() if args.estatisticas else None
+        metodo = METODOS[args.metodo or 'myhill_nerode']
+        if args.cache_resultados is None:
+            afd_minimizado = metodo(afd, cria_rastro(args.rastro), validar=False, estatisticas=estatisticas)  # Recebe a estrutura do afd minimizado pelo algoritmo escolhido
+        else:
+            cache = CacheMinimizacao(diretorio=args.cache_resultados or None)
+            afd_minimizado = minimiza_com_cache(afd, cache, metodo, cria_rastro(args.rastro), validar=False, estatisticas=estatisticas)
+        exibir_diagrama_afd(afd_minimizado, "afd_minimizado", args.diagrama, args.limite_diagrama)  # Exibe o AFD minimizado
         afd_formatado = json.dumps(afd_minimizado, indent=4)
         print("Modelo do AFD minimizado: ")
         print(afd_formatado)
+        if estatisticas is not None:
+            print("Estatísticas da minimização: ")
+            print(json.dumps(estatisticas.para_dict(), indent=4))
+        if args.reconhece:
+            reconhece_arquivo(afd_minimizado, args.reconhece)
     else:
         print("AFD inválido. Corrija o arquivo e tente novamente.")
 